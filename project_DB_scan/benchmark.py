@@ -0,0 +1,93 @@
+import argparse
+import time
+from clustering import Cluster, read_points
+
+# Bundled data sets: (input file, n, eps, minpts)
+DATASETS = [
+    ("input1.txt", 8, 15, 22),
+    ("input2.txt", 5, 2, 7),
+    ("input3.txt", 4, 5, 5),
+]
+
+
+# Previous cluster expansion: list membership & list.pop(0)
+def legacy_get_clusters(dbscan):
+    clusters = []
+    visited = []
+    for cpt in dbscan.core_pts:
+        if cpt in visited:
+            continue
+        queue = [cpt]
+        cluster = [cpt]
+        visited.append(cpt)
+        while len(queue)>0:
+            cur = queue.pop(0)
+            if cur not in dbscan.core_pts:
+                continue
+            for nxt in dbscan.neighbors[cur]:
+                if nxt not in visited:
+                    visited.append(nxt)
+                    cluster.append(nxt)
+                    queue.append(nxt)
+        clusters.append(cluster)
+    clusters.sort(key=len, reverse=True)
+    return clusters[:dbscan.n]
+
+
+def read_clusters(file_names):
+    ret = []
+    for file_name in file_names:
+        with open(file_name, 'r') as f:
+            ret.append([int(line) for line in f.readlines()])
+    return ret
+
+
+# Mean of best Jaccard similarity of each ideal cluster
+def get_agreement(clusters, ideal):
+    clusters = [set(cluster) for cluster in clusters]
+    total = 0.0
+    for answer in map(set, ideal):
+        total += max(len(answer & cluster) / len(answer | cluster) for cluster in clusters)
+    return total / len(ideal)
+
+
+if __name__ == "__main__":
+    # Parse arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--index", type=str, choices=["brute", "grid"], default="grid")
+    parser.add_argument("--backend", type=str, choices=["python", "numpy"], default="python")
+    parser.add_argument("--block-size", type=int, default=1<<16)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--skip-legacy", action="store_true", help="do not time previous cluster expansion")
+    args = parser.parse_args()
+
+    for input_file, n, eps, minpts in DATASETS:
+        title = input_file.split('.')[0]
+        expected = read_clusters([title+"_cluster_{}.txt".format(i) for i in range(n)])
+        ideal = read_clusters([title+"_cluster_{}_ideal.txt".format(i) for i in range(n)])
+
+        points = read_points(input_file)
+        start = time.perf_counter()
+        dbscan = Cluster(eps, minpts, n, args.index, args.backend, args.block_size, args.workers).fit(points)
+        total_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if args.backend == "numpy":
+            dbscan._get_clusters_numpy()
+        elif args.workers > 1:
+            dbscan._get_clusters_parallel()
+        else:
+            dbscan._get_clusters()
+        expand_time = time.perf_counter() - start
+
+        print("{}: total {:.3f}s, expansion {:.4f}s".format(input_file, total_time, expand_time))
+        # Previous expansion needs neighbor lists of serial python backend
+        if not args.skip_legacy and args.backend == "python" and args.workers == 1:
+            start = time.perf_counter()
+            legacy = legacy_get_clusters(dbscan)
+            legacy_time = time.perf_counter() - start
+            print("    legacy expansion {:.4f}s (x{:.1f}), same clusters: {}".format(legacy_time, legacy_time/expand_time, legacy == dbscan.clusters))
+        # Parallel mode lists members in input order
+        same_members = [sorted(c) for c in expected] == [sorted(c) for c in dbscan.clusters]
+        print("    matches {}_cluster_*.txt: {} (same members: {})".format(title, expected == dbscan.clusters, same_members))
+        print("    agreement with {}_cluster_*_ideal.txt: {:.3f}".format(title, get_agreement(dbscan.clusters, ideal)))
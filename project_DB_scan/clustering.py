@@ -1,33 +1,251 @@
 import argparse
+from bisect import bisect_right
+from collections import deque
+from math import ceil, sqrt
+from multiprocessing import Pool
+
+try:
+    import numpy as np
+except ImportError:
+    # Only numpy backend needs numpy
+    np = None
+
+class UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        root = self.parent.setdefault(x, x)
+        while root != self.parent[root]:
+            root = self.parent[root]
+        # Path compression
+        while x != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, x, y):
+        x_root, y_root = self.find(x), self.find(y)
+        # Smaller index becomes root
+        if x_root < y_root:
+            self.parent[y_root] = x_root
+        elif y_root < x_root:
+            self.parent[x_root] = y_root
+
+
+# Cell of eps-grid: side eps (any side >= eps works when eps is 0)
+def get_cell(x, y, eps):
+    side = eps if eps > 0 else 1
+    return int(x//side), int(y//side)
+
+
+# Eps-grid: {(cell x, cell y): [key ...] ...}
+# Points: iterable of (key, (x, y))
+def build_grid(points, eps):
+    grid = {}
+    for key, (x, y) in points:
+        grid.setdefault(get_cell(x, y, eps), []).append(key)
+    return grid
+
+
+# Scan 3 x 3 cells around (x, y): [(squared distance, key) ...] within eps except key itself
+# Coords: key -> (x, y) lookup(dictionary or list)
+def grid_neighbors(grid, coords, key, x, y, eps):
+    eps_sq = eps**2
+    cx, cy = get_cell(x, y, eps)
+    ret = []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for other in grid.get((cx+dx, cy+dy), ()):
+                if other == key:
+                    continue
+                ox, oy = coords[other]
+                dist = (x-ox)**2 + (y-oy)**2
+                if dist <= eps_sq:
+                    ret.append((dist, other))
+    return ret
+
+
+# Cluster one tile(worker process)
+# Points are given by input index: owned points & halo points(within eps of tile)
+# Return core flags of owned points, local components, edges to halo & neighbors of owned non-core points
+def cluster_tile(task):
+    eps, minpts, owned, halo = task
+    coords = {**owned, **halo}
+    grid = build_grid(coords.items(), eps)
+
+    # Neighbors of owned points are complete: every neighbor lies in tile or halo
+    neighbors = {}
+    for idx, (x, y) in owned.items():
+        neighbors[idx] = sorted(other for _, other in grid_neighbors(grid, coords, idx, x, y, eps))
+
+    core = {idx for idx, val in neighbors.items() if len(val) >= minpts}
+    # Local union of core points inside tile
+    uf = UnionFind()
+    cross = []
+    for idx in core:
+        uf.find(idx)
+        for other in neighbors[idx]:
+            if other in core:
+                uf.union(idx, other)
+            elif other in halo:
+                cross.append((idx, other))
+    roots = {idx: uf.find(idx) for idx in core}
+    border = {idx: val for idx, val in neighbors.items() if idx not in core and val}
+    return roots, cross, border
+
+
+# Read points: {'id': (x, y) ...}
+def read_points(input_file):
+    with open(input_file, 'r') as f:
+        data = [line.split() for line in f.readlines()]
+    return {int(e[0]): (float(e[1]), float(e[2])) for e in data}
+
 
 class Cluster:
-    def __init__(self, args):
+    def __init__(self, eps, minpts, n=None, index="grid", backend="python", block_size=1<<16, workers=1):
         # Initialize values
-        self.input_file = args.input_file
-        self.n = args.n
-        self.eps = args.eps
-        self.minpts = args.minpts
-        
-        # Save output file names
-        title = self.input_file.split('.')[0] 
-        self.output_file = [title+"_cluster_{}.txt".format(i) for i in range(self.n)]
+        self.n = n
+        self.eps = eps
+        self.minpts = minpts
+        self.index = index
+        self.backend = backend
+        self.block_size = block_size
+        self.workers = workers
+        # Sorted neighbor distances for parameter sweep
+        self._sweep_cache = None
 
-        # Extract data
-        with open(self.input_file, 'r') as f:
-            data = [line.split() for line in f.readlines()]
-            self.data = {int(e[0]): (float(e[1]), float(e[2])) for e in data}
 
-        # Get each data's neighbors & corepoints
-        self._get_neighbors()
-        self._get_corepoints()
+    # Cluster input file of command line arguments & write result
+    @classmethod
+    def from_args(cls, args):
+        dbscan = cls(args.eps, args.minpts, args.n, args.index, args.backend, args.block_size, args.workers)
+        dbscan.fit(read_points(args.input_file))
 
-        # Set visited array
-        self.visited = []
-        # Get clusters()
-        self._get_clusters()
+        # Save output file names
+        title = args.input_file.split('.')[0] 
+        dbscan.output_file = [title+"_cluster_{}.txt".format(i) for i in range(args.n)]
 
         # Write result 
-        self._write_result()
+        dbscan._write_result()
+        return dbscan
+
+
+    # Points: {'id': (x, y) ...} or array of (x, y) (id denotes position)
+    def fit(self, points):
+        if isinstance(points, dict):
+            self.data = points
+        else:
+            self.data = {i: (float(x), float(y)) for i, (x, y) in enumerate(points)}
+        self._sweep_cache = None
+        self._core_grid = None
+
+        # NumPy backend: arrays & block-wise distance computation
+        if self.backend == "numpy":
+            if np is None:
+                raise ImportError("numpy backend requires numpy")
+            self._get_neighbors_numpy()
+            self._get_corepoints_numpy()
+            self._get_clusters_numpy()
+        # Parallel: tiles with eps halo & union-find merge
+        elif self.workers > 1:
+            self._get_clusters_parallel()
+        else:
+            # Get each data's neighbors & corepoints
+            self._get_neighbors()
+            self._get_corepoints()
+
+            # Get clusters()
+            self._get_clusters()
+        return self
+
+
+    # Labels of points in input order: cluster rank(0 denotes largest), -1 denotes noise
+    def fit_predict(self, points):
+        return self.fit(points).labels
+
+
+    # Assign new points to cluster of nearest core point within eps
+    def predict(self, points):
+        if self._core_grid is None:
+            self._core_grid = build_grid(((key, self.data[key]) for key in self.core_pts), self.eps)
+            self._label_of = dict(zip(self.data.keys(), self.labels))
+
+        ret = []
+        for x, y in points:
+            # Nearest core point(ties keep grid order)
+            best = None
+            for dist, key in grid_neighbors(self._core_grid, self.data, None, x, y, self.eps):
+                if best is None or dist < best[0]:
+                    best = (dist, key)
+            ret.append(self._label_of[best[1]] if best is not None else -1)
+        return ret
+
+
+    # Labels for each (eps, minpts) pair from cached sorted neighbor distances
+    def sweep(self, params):
+        max_eps = max(eps for eps, _ in params)
+        if self._sweep_cache is None or self._sweep_cache[0] < max_eps:
+            self._build_sweep_cache(max_eps)
+        return {(eps, minpts): self._get_labels_from_cache(eps, minpts) for eps, minpts in params}
+
+
+    def _build_sweep_cache(self, max_eps):
+        # Neighbors within max eps sorted by distance: [[squared distance ...] ...], [[position ...] ...]
+        points = list(self.data.values())
+        grid = build_grid(enumerate(points), max_eps)
+
+        dists = []
+        positions = []
+        for pos, (x, y) in enumerate(points):
+            found = grid_neighbors(grid, points, pos, x, y, max_eps)
+            found.sort()
+            dists.append([dist for dist, _ in found])
+            positions.append([other for _, other in found])
+        self._sweep_cache = (max_eps, dists, positions)
+
+
+    def _get_labels_from_cache(self, eps, minpts):
+        _, dists, positions = self._sweep_cache
+        eps_sq = eps**2
+        # Neighbors within eps: prefix of sorted neighbors
+        counts = [bisect_right(dist, eps_sq) for dist in dists]
+        core = [cnt >= minpts for cnt in counts]
+
+        labels = [-1]*len(dists)
+        sizes = []
+        # Visit core points first
+        # BFS
+        for seed in range(len(dists)):
+            if not core[seed] or labels[seed] != -1:
+                continue
+            label = len(sizes)
+            labels[seed] = label
+            size = 1
+            queue = deque([seed])
+            while queue:
+                cur = queue.popleft()
+                if not core[cur]:
+                    continue
+                for nxt in positions[cur][:counts[cur]]:
+                    if labels[nxt] == -1:
+                        labels[nxt] = label
+                        size += 1
+                        queue.append(nxt)
+            sizes.append(size)
+
+        # Rank clusters by size(ties keep visiting order)
+        rank = {label: i for i, label in enumerate(sorted(range(len(sizes)), key=lambda label: -sizes[label]))}
+        return [rank[label] if label != -1 else -1 for label in labels]
+
+
+    def _set_clusters(self, clusters):
+        # Sort clusters
+        clusters.sort(key=len, reverse=True)
+        # Label of each point in input order
+        label_of = {key: label for label, cluster in enumerate(clusters) for key in cluster}
+        self.labels = [label_of.get(key, -1) for key in self.data.keys()]
+        # Select n clusters
+        self.clusters = clusters[:self.n]
 
 
     @staticmethod
@@ -35,47 +253,234 @@ class Cluster:
         return ((x1-x2)**2 + (y1-y2)**2)**(1/2)
 
 
+    @staticmethod
+    def _get_squared_distance(x1, y1, x2, y2):
+        return (x1-x2)**2 + (y1-y2)**2
+
+
     def _get_neighbors(self):
+        # Brute force: compare every pair
+        if self.index == "brute":
+            self._get_neighbors_brute()
+        # Grid: compare points in adjacent cells only
+        else:
+            self._get_neighbors_grid()
+
+
+    def _get_neighbors_brute(self):
+        eps_sq = self.eps**2
         self.neighbors = {key: [] for key in self.data.keys()}
         for e1_key, (e1_x, e1_y) in self.data.items():
             for e2_key, (e2_x, e2_y) in self.data.items():
                 if e1_key == e2_key:
                     continue
-                dist = self._get_distance(e1_x, e1_y, e2_x, e2_y)
-                if dist <= self.eps:
+                dist = self._get_squared_distance(e1_x, e1_y, e2_x, e2_y)
+                if dist <= eps_sq:
                     self.neighbors[e1_key].append(e2_key)
 
 
+    def _get_neighbors_grid(self):
+        # Grid: {(cell x, cell y): [key ...] ...}
+        self.grid = build_grid(self.data.items(), self.eps)
+
+        # Keep input order of neighbors as brute force does
+        order = {key: i for i, key in enumerate(self.data.keys())}
+        self.neighbors = {}
+        for key, (x, y) in self.data.items():
+            found = [other for _, other in grid_neighbors(self.grid, self.data, key, x, y, self.eps)]
+            found.sort(key=order.__getitem__)
+            self.neighbors[key] = found
+
+
     def _get_corepoints(self):
         self.core_pts = [key for key, val in self.neighbors.items() if len(val) >= self.minpts]
+        # O(1) membership check
+        self.core_set = set(self.core_pts)
 
         
     def _get_clusters(self):
         self.clusters = []
+        # Set visited set
+        self.visited = set()
         # Visit core points first
         # BFS
         for cpt in self.core_pts:
             if cpt in self.visited:
                 continue
-            queue = [cpt]
+            queue = deque([cpt])
             cluster = [cpt]
-            self.visited.append(cpt)
-            while len(queue)>0:
-                cur = queue.pop(0)
-                if cur not in self.core_pts:
+            self.visited.add(cpt)
+            while queue:
+                cur = queue.popleft()
+                if cur not in self.core_set:
                     continue
                 for nxt in self.neighbors[cur]:
                     if nxt not in self.visited:
-                        self.visited.append(nxt)
+                        self.visited.add(nxt)
                         cluster.append(nxt)
                         queue.append(nxt)
 
             self.clusters.append(cluster)
 
-        # Sort clusters
-        self.clusters.sort(key=len, reverse=True)
-        # Select n clusters
-        self.clusters = self.clusters[:self.n]
+        self._set_clusters(self.clusters)
+
+
+    def _get_tiles(self, points):
+        # Split bounding box into t x t tiles: several tiles per worker for load balancing
+        t = ceil(sqrt(4*self.workers))
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        min_x, min_y = min(xs), min(ys)
+        width = (max(xs)-min_x) / t or 1
+        height = (max(ys)-min_y) / t or 1
+        clip = lambda v: min(max(v, 0), t-1)
+
+        tiles = {}
+        for idx, (x, y) in enumerate(points):
+            tx, ty = clip(int((x-min_x)//width)), clip(int((y-min_y)//height))
+            tiles.setdefault((tx, ty), ({}, {}))[0][idx] = (x, y)
+        # Halo: points within eps of tile
+        for idx, (x, y) in enumerate(points):
+            tx, ty = clip(int((x-min_x)//width)), clip(int((y-min_y)//height))
+            for hx in range(clip(int((x-self.eps-min_x)//width)), clip(int((x+self.eps-min_x)//width))+1):
+                for hy in range(clip(int((y-self.eps-min_y)//height)), clip(int((y+self.eps-min_y)//height))+1):
+                    if (hx, hy) != (tx, ty) and (hx, hy) in tiles:
+                        tiles[(hx, hy)][1][idx] = (x, y)
+        return [(self.eps, self.minpts, owned, halo) for owned, halo in tiles.values()]
+
+
+    def _get_clusters_parallel(self):
+        keys = list(self.data.keys())
+        points = list(self.data.values())
+        with Pool(self.workers) as pool:
+            results = pool.map(cluster_tile, self._get_tiles(points)) if points else []
+
+        # Merge local components & edges across tile boundaries
+        uf = UnionFind()
+        core = set()
+        for roots, _, _ in results:
+            core.update(roots)
+            for idx, root in roots.items():
+                uf.union(idx, root)
+        for _, cross, _ in results:
+            for idx, other in cross:
+                if other in core:
+                    uf.union(idx, other)
+        self.core_pts = [keys[idx] for idx in sorted(core)]
+
+        # Root is smallest core index of component -> same visiting order as serial BFS
+        members = {}
+        for idx in core:
+            members.setdefault(uf.find(idx), []).append(idx)
+        # Border point belongs to cluster visited first
+        for _, _, border in results:
+            for idx, val in border.items():
+                roots = [uf.find(other) for other in val if other in core]
+                if roots:
+                    members[min(roots)].append(idx)
+
+        self._set_clusters([[keys[idx] for idx in sorted(members[root])] for root in sorted(members)])
+
+
+    def _get_neighbors_numpy(self):
+        # Point ids & coordinates as contiguous arrays (input order)
+        self.keys = np.array(list(self.data.keys()), dtype=np.int64)
+        coords = np.array(list(self.data.values()), dtype=np.float64).reshape(-1, 2)
+        n = len(self.keys)
+        eps_sq = self.eps**2
+
+        # Sort points by (strip of width eps, y): neighbors of a block lie in y windows of adjacent strips
+        strip = np.floor(coords[:, 0] / (self.eps if self.eps > 0 else 1)).astype(np.int64)
+        order = np.lexsort((coords[:, 1], strip))
+        xs = np.ascontiguousarray(coords[order, 0])
+        ys = np.ascontiguousarray(coords[order, 1])
+        strip = strip[order]
+        # Strip: {strip id: (first index, last index + 1) ...}
+        strip_ids, strip_starts = np.unique(strip, return_index=True)
+        strip_ends = np.append(strip_starts[1:], n)
+        strip_range = {int(sid): (int(a), int(b)) for sid, a, b in zip(strip_ids, strip_starts, strip_ends)}
+
+        # Edge key: row*n + column (input order)
+        edges = []
+        for sid, (strip_start, strip_end) in strip_range.items():
+            near = [strip_range[sid+d] for d in (-1, 0, 1) if sid+d in strip_range]
+            start = strip_start
+            while start < strip_end:
+                # Bound block memory: rows x columns <= block_size
+                width = self._get_window(xs, ys, near, start, start+1)[1]
+                end = min(strip_end, start + max(1, self.block_size // max(width, 1)))
+                window, width = self._get_window(xs, ys, near, start, end)
+                while end-start > 1 and (end-start)*width > self.block_size:
+                    end = start + (end-start)//2
+                    window, width = self._get_window(xs, ys, near, start, end)
+
+                dx = xs[start:end, None] - xs[None, window]
+                dy = ys[start:end, None] - ys[None, window]
+                r, c = np.nonzero(dx*dx + dy*dy <= eps_sq)
+                r += start
+                c = window[c]
+                # Exclude itself
+                keep = r != c
+                edges.append(order[r[keep]]*n + order[c[keep]])
+                start = end
+
+        # Adjacency(CSR): neighbors of i are indices[indptr[i]:indptr[i+1]] in input order
+        # Sort edges by (row, column)
+        edges = np.concatenate(edges) if edges else np.zeros(0, dtype=np.int64)
+        edges.sort()
+        self.counts = np.bincount(edges // max(n, 1), minlength=n)
+        self.indptr = np.concatenate(([0], np.cumsum(self.counts)))
+        self.indices = edges % max(n, 1)
+
+
+    def _get_window(self, xs, ys, near, start, end):
+        # Column indices within y window [y(start) - eps, y(end-1) + eps] of nearby strips
+        ranges = []
+        for strip_start, strip_end in near:
+            lo = strip_start + np.searchsorted(ys[strip_start:strip_end], ys[start]-self.eps, side="left")
+            hi = strip_start + np.searchsorted(ys[strip_start:strip_end], ys[end-1]+self.eps, side="right")
+            ranges.append(np.arange(lo, hi))
+        window = np.concatenate(ranges)
+        return window, len(window)
+
+
+    def _get_corepoints_numpy(self):
+        self.core_flags = self.counts >= self.minpts
+        self.core_pts = self.keys[self.core_flags].tolist()
+
+
+    def _get_clusters_numpy(self):
+        visited = np.zeros(len(self.keys), dtype=bool)
+        clusters = []
+        # Visit core points first
+        # BFS level by level: same visiting order as queue
+        for seed in np.flatnonzero(self.core_flags):
+            if visited[seed]:
+                continue
+            visited[seed] = True
+            frontier = np.array([seed])
+            members = [frontier]
+            while len(frontier) > 0:
+                # Only core points expand
+                frontier = frontier[self.core_flags[frontier]]
+                starts = self.indptr[frontier]
+                lengths = self.indptr[frontier+1] - starts
+                total = lengths.sum()
+                if total == 0:
+                    break
+                # Gather neighbors of frontier in order
+                offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+                cand = self.indices[offsets]
+                cand = cand[~visited[cand]]
+                # First discovery wins
+                _, first = np.unique(cand, return_index=True)
+                frontier = cand[np.sort(first)]
+                visited[frontier] = True
+                members.append(frontier)
+
+            clusters.append(self.keys[np.concatenate(members)].tolist())
+
+        self._set_clusters(clusters)
 
 
     def _write_result(self):
@@ -85,6 +490,158 @@ class Cluster:
                     f.write("{}\n".format(e))
         
 
+class IncrementalCluster:
+    def __init__(self, eps, minpts):
+        # Initialize values
+        self.eps = eps
+        self.minpts = minpts
+
+        # Data: {'id': (x, y) ...}
+        # Grid: {(cell x, cell y): {'id' ...} ...}
+        # Neighbors: {'id': {'id' ...} ...}
+        self.data = {}
+        self.grid = {}
+        self.neighbors = {}
+        self.core_set = set()
+
+        # Label: {'id': cluster id ...} (noise has no label)
+        # Members: {cluster id: {'id' ...} ...}
+        self.labels = {}
+        self.members = {}
+        self._next_label = 0
+
+
+    def _find_neighbors(self, key, x, y):
+        return {other for _, other in grid_neighbors(self.grid, self.data, key, x, y, self.eps)}
+
+
+    def _new_label(self):
+        label = self._next_label
+        self._next_label += 1
+        self.members[label] = set()
+        return label
+
+
+    def _set_label(self, key, label):
+        old = self.labels.get(key)
+        if old is not None:
+            self.members[old].discard(key)
+        self.labels[key] = label
+        self.members[label].add(key)
+
+
+    def _merge(self, labels):
+        # Relabel smaller clusters into largest one
+        target = max(labels, key=lambda label: (len(self.members[label]), -label))
+        for label in labels:
+            if label == target:
+                continue
+            for key in self.members.pop(label):
+                self.labels[key] = target
+                self.members[target].add(key)
+        return target
+
+
+    def _attach_core(self, key):
+        # Merge clusters of core neighbors
+        labels = {self.labels[other] for other in self.neighbors[key] if other in self.core_set and other in self.labels}
+        label = self._merge(labels) if labels else self._new_label()
+        self._set_label(key, label)
+        # Unlabeled neighbors become border points
+        for other in self.neighbors[key]:
+            if other not in self.labels:
+                self._set_label(other, label)
+
+
+    def _attach_border(self, key):
+        labels = [self.labels[other] for other in self.neighbors[key] if other in self.core_set]
+        if labels:
+            self._set_label(key, min(labels))
+
+
+    def _split(self, label):
+        members = self.members.pop(label, set())
+        for key in members:
+            del self.labels[key]
+        # BFS from remaining core points: each component becomes cluster
+        for cpt in sorted(members & self.core_set):
+            if cpt in self.labels:
+                continue
+            new_label = self._new_label()
+            self._set_label(cpt, new_label)
+            queue = deque([cpt])
+            while queue:
+                cur = queue.popleft()
+                if cur not in self.core_set:
+                    continue
+                for nxt in self.neighbors[cur]:
+                    if nxt not in self.labels:
+                        self._set_label(nxt, new_label)
+                        queue.append(nxt)
+        # Unreached points: border of another cluster or noise
+        for key in members:
+            if key not in self.labels:
+                self._attach_border(key)
+
+
+    # Insert point: update neighbors & core status around it, then merge affected clusters
+    def insert(self, key, x, y):
+        if key in self.data:
+            self.delete(key)
+        found = self._find_neighbors(key, x, y)
+        self.data[key] = (x, y)
+        self.grid.setdefault(get_cell(x, y, self.eps), set()).add(key)
+        self.neighbors[key] = found
+        for other in found:
+            self.neighbors[other].add(key)
+
+        # New core points: inserted point & neighbors reaching minpts
+        new_cores = [p for p in [key] + sorted(found) if p not in self.core_set and len(self.neighbors[p]) >= self.minpts]
+        self.core_set.update(new_cores)
+        for p in new_cores:
+            self._attach_core(p)
+        if key not in self.core_set:
+            self._attach_border(key)
+
+
+    # Delete point: update neighbors & core status around it, then split affected clusters
+    def delete(self, key):
+        x, y = self.data.pop(key)
+        cell = get_cell(x, y, self.eps)
+        self.grid[cell].discard(key)
+        if not self.grid[cell]:
+            del self.grid[cell]
+        found = self.neighbors.pop(key)
+        for other in found:
+            self.neighbors[other].discard(key)
+
+        affected = set()
+        label = self.labels.pop(key, None)
+        if label is not None:
+            self.members[label].discard(key)
+        if key in self.core_set:
+            self.core_set.discard(key)
+            affected.add(label)
+        # Lost core points: neighbors dropping below minpts
+        for p in found:
+            if p in self.core_set and len(self.neighbors[p]) < self.minpts:
+                self.core_set.discard(p)
+                affected.add(self.labels[p])
+        for label in affected:
+            self._split(label)
+
+
+    def insert_many(self, points):
+        for key, (x, y) in points:
+            self.insert(key, x, y)
+
+
+    # Clusters sorted by size: [['id' ...] ...]
+    def get_clusters(self, n=None):
+        clusters = sorted((sorted(members) for members in self.members.values() if members), key=len, reverse=True)
+        return clusters[:n]
+
+
 if __name__ == "__main__":
     # Parse arguments
     parser = argparse.ArgumentParser()
@@ -92,7 +649,11 @@ if __name__ == "__main__":
     parser.add_argument("n", type=int)
     parser.add_argument("eps", type=int)
     parser.add_argument("minpts", type=int)
+    parser.add_argument("--index", type=str, choices=["brute", "grid"], default="grid")
+    parser.add_argument("--backend", type=str, choices=["python", "numpy"], default="python")
+    parser.add_argument("--block-size", type=int, default=1<<16, help="max distance matrix entries per block(numpy backend)")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes clustering tiles(python backend)")
     args = parser.parse_args()
 
     # Create cluster object
-    dbscan = Cluster(args)
+    dbscan = Cluster.from_args(args)
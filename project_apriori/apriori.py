@@ -1,75 +1,588 @@
+import argparse
+import heapq
 import sys
-from itertools import combinations
+import time
+from array import array
+from collections import namedtuple
+from multiprocessing import Pool
 
 '''
-    Feature: Prune candidates by support and length
-    Arguments: cand(type: list[set])
-    Return value type: dictionary(key: tuple, value: float]
+    Feature: Encode transactions as sorted integer arrays & group them by chunk
+    Arguments: transactions(type: iterable(iterable[integer])), chunk_size(type: integer)
+    Return value type: generator(list[array])
+'''
+def encode_chunks(transactions, chunk_size):
+    chunk = []
+    for transaction in transactions:
+        chunk.append(array('i', sorted(set(transaction))))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+'''
+    Feature: Read transaction file line by line
+    Arguments: input_file(type: string)
+    Return value type: generator(map(integer))
 '''
-def prune(cand):
+def read_transactions(input_file):
+    with open(input_file, 'r') as f:
+        for line in f:
+            yield map(int,line.split())
+
+
+'''
+    Feature: Read transaction file chunk by chunk
+             & Encode each transaction as sorted integer array
+    Arguments: input_file(type: string), chunk_size(type: integer)
+    Return value type: generator(list[array])
+'''
+def read_chunks(input_file, chunk_size):
+    return encode_chunks(read_transactions(input_file), chunk_size)
+
+
+'''
+    Feature: Transaction source holding every transaction in memory
+    [Type]
+        chunks: list[list[array]]
+        layouts: dictionary(key: string(engine), value: list(prepared chunk))
+'''
+class MemorySource:
+    def __init__(self, transactions, chunk_size=100000):
+        self._chunks = list(encode_chunks(transactions, chunk_size))
+        self._layouts = {}
+
+    def chunks(self):
+        return iter(self._chunks)
+
+    # Prepare each chunk once and reuse it at every level
+    def layouts(self, engine):
+        if engine not in self._layouts:
+            prepare, _ = ENGINES[engine]
+            self._layouts[engine] = [prepare(chunk) for chunk in self._chunks]
+        return iter(self._layouts[engine])
+
+    # Source of every n-th chunk from index-th chunk(part of pool worker)
+    def part(self, index, n):
+        ret = MemorySource([])
+        ret._chunks = self._chunks[index::n]
+        return ret
+
+
+'''
+    Feature: Transaction source re-reading input file chunk by chunk at every pass
+    [Type]
+        input_file: string
+        chunk_size: integer
+        index, n: integer(every n-th chunk from index-th chunk is read)
+'''
+class StreamSource:
+    def __init__(self, input_file, chunk_size=100000, index=0, n=1):
+        self.input_file = input_file
+        self.chunk_size = chunk_size
+        self.index = index
+        self.n = n
+
+    def chunks(self):
+        if self.n == 1:
+            return read_chunks(self.input_file, self.chunk_size)
+        # Skip transactions of other chunks before encoding
+        transactions = (transaction for tid, transaction in enumerate(read_transactions(self.input_file)) if tid//self.chunk_size % self.n == self.index)
+        return encode_chunks(transactions, self.chunk_size)
+
+    def layouts(self, engine):
+        prepare, _ = ENGINES[engine]
+        return map(prepare, self.chunks())
+
+    # Source of every n-th chunk from index-th chunk(part of pool worker)
+    def part(self, index, n):
+        return StreamSource(self.input_file, self.chunk_size, index, n)
+
+
+'''
+    Feature: Iterate transactions of source as patterns
+    Arguments: source(type: MemorySource or StreamSource)
+    Return value type: generator(tuple(array, integer(count)))
+'''
+def iter_patterns(source):
+    for chunk in source.chunks():
+        for transaction in chunk:
+            yield transaction, 1
+
+
+'''
+    Feature: Build horizontal layout(set of each transaction)
+    Arguments: transactions(type: list[array])
+    Return value type: list[set]
+'''
+def build_horizontal(transactions):
+    return [set(transaction) for transaction in transactions]
+
+
+'''
+    Feature: Count support of candidates by scanning transactions(horizontal layout)
+    Arguments: cand(type: list[set]), table(type: list[set])
+    Return value type: list[integer]
+'''
+def count_horizontal(cand, table):
     # Make counting table
-    cnt_table = {idx: 0 for idx, _ in enumerate(cand)}
+    cnt_table = [0]*len(cand)
     for transaction in table:
         for idx,itemset in enumerate(cand):
             # Check whether each transaction is superset of each itemset
             if transaction >= itemset:
                 cnt_table[idx] += 1
-    # Filter by minimum support
-    ret = {tuple(cand[key]): val/len(table)*100 for key, val in cnt_table.items() if val>=min_sup}
+    return cnt_table
+
+
+'''
+    Feature: Build vertical layout(transaction id bitset of each item)
+    Arguments: transactions(type: list[array])
+    Return value type: dictionary(key: integer, value: integer(bitset))
+'''
+def build_vertical(transactions):
+    # Collect transaction ids of each item
+    tids = {}
+    for tid, transaction in enumerate(transactions):
+        for item_id in transaction:
+            tids.setdefault(item_id, []).append(tid)
+    # Build each bitset once: set bits in byte buffer(little endian)
+    size = (len(transactions)+7)//8
+    ret = {}
+    for item_id, tid_list in tids.items():
+        buf = bytearray(size)
+        for tid in tid_list:
+            buf[tid >> 3] |= 1 << (tid & 7)
+        ret[item_id] = int.from_bytes(buf, 'little')
+    return ret
+
+
+'''
+    Feature: Count set bits
+    Arguments: bitset(type: integer)
+    Return value type: integer
+'''
+def popcount(bitset):
+    return bin(bitset).count('1')
+
+
+'''
+    Feature: Count support of candidates by intersecting bitsets(vertical layout)
+    Arguments: cand(type: list[set]), vertical(type: dictionary(key: integer, value: integer(bitset)))
+    Return value type: list[integer]
+'''
+def count_bitset(cand, vertical):
+    cnt_table = []
+    for itemset in cand:
+        # Intersect bitsets of each item
+        bitset = -1
+        for item_id in itemset:
+            bitset &= vertical.get(item_id, 0)
+            if not bitset:
+                break
+        cnt_table.append(popcount(bitset))
+    return cnt_table
+
+
+'''
+    Feature: Build prefix trie of candidates keyed on sorted items
+    Arguments: cand(type: list[set])
+    Return value type: dictionary(key: integer, value: dictionary or integer(candidate index))
+'''
+def build_trie(cand):
+    root = {}
+    for idx, itemset in enumerate(cand):
+        items = sorted(itemset)
+        node = root
+        for item_id in items[:-1]:
+            node = node.setdefault(item_id, {})
+        # Leaf stores index of candidate
+        node[items[-1]] = idx
+    return root
+
+
+'''
+    Feature: Count support of candidates by walking prefix trie with each transaction
+    Arguments: cand(type: list[set]), transactions(type: list[array](sorted))
+    Return value type: list[integer]
+'''
+def count_trie(cand, transactions):
+    cnt_table = [0]*len(cand)
+    if not cand:
+        return cnt_table
+    # Every candidate has same length at each level
+    length = len(cand[0])
+    root = build_trie(cand)
+    for items in transactions:
+        # DFS: (trie node, start position in transaction, depth)
+        stack = [(root, 0, 1)]
+        while stack:
+            node, start, depth = stack.pop()
+            # Leave enough items for remaining depth
+            for pos in range(start, len(items)-length+depth):
+                child = node.get(items[pos])
+                if child is None:
+                    continue
+                if depth == length:
+                    cnt_table[child] += 1
+                else:
+                    stack.append((child, pos+1, depth+1))
+    return cnt_table
+
+
+# Support counting engines: (prepare chunk, count candidates in prepared chunk)
+ENGINES = {
+    'horizontal': (build_horizontal, count_horizontal),
+    'bitset': (build_vertical, count_bitset),
+    'trie': (list, count_trie),
+}
+
+
+# Part of source & engine of pool worker: set once by initializer
+worker_source = None
+worker_engine = None
+
+
+'''
+    Feature: Keep part of source in worker process(pool initializer)
+    Arguments: source(type: MemorySource or StreamSource), engine(type: string)
+    Return value type: None
+'''
+def init_counter(source, engine):
+    global worker_source, worker_engine
+    worker_source, worker_engine = source, engine
+
+
+'''
+    Feature: Count support of candidates over part of source(worker process)
+             Layouts of MemorySource part are prepared at first level & reused
+    Arguments: cand(type: list[set])
+    Return value type: list[integer]
+'''
+def count_part(cand):
+    return count_support(cand, worker_source, worker_engine)
+
+
+'''
+    Feature: Start one single-process pool per part of source: each level sends candidates only
+    Arguments: source(type: MemorySource or StreamSource), engine(type: string), workers(type: integer)
+    Return value type: list[Pool]
+'''
+def start_counters(source, engine, workers):
+    return [Pool(1, initializer=init_counter, initargs=(source.part(index, workers), engine)) for index in range(workers)]
+
+
+'''
+    Feature: Count support of candidates over every chunk of source
+             & Merge partial counts of each chunk(or of each worker)
+    Arguments: cand(type: list[set]), source(type: MemorySource or StreamSource), engine(type: string), pools(type: list[Pool] or None)
+    Return value type: list[integer]
+'''
+def count_support(cand, source, engine, pools=None):
+    cnt_table = [0]*len(cand)
+    if pools is None:
+        _, count = ENGINES[engine]
+        partials = (count(cand, layout) for layout in source.layouts(engine))
+    else:
+        results = [pool.apply_async(count_part, (cand,)) for pool in pools]
+        partials = (result.get() for result in results)
+    for partial_cnt in partials:
+        for idx, val in enumerate(partial_cnt):
+            cnt_table[idx] += val
+    return cnt_table
+
+
+'''
+    Feature: Prune candidates by support and length
+    Arguments: cand(type: list[set]), source(type: MemorySource or StreamSource), min_cnt(type: float), total(type: integer),
+               engine(type: string), pools(type: list[Pool] or None)
+    Return value type: dictionary(key: tuple, value: float]
+'''
+def prune(cand, source, min_cnt, total, engine='horizontal', pools=None):
+    # Make counting table
+    cnt_table = count_support(cand, source, engine, pools)
+    # Filter by minimum support: key is sorted tuple(same as fp_growth)
+    ret = {tuple(sorted(cand[idx])): val/total*100 for idx, val in enumerate(cnt_table) if val>=min_cnt}
 
     return ret        
 
 
 '''
-    Feature: Generate candidates by self-joining
+    Feature: Generate frequent item sets level by level(Apriori)
+    Arguments: source(type: MemorySource or StreamSource), min_sup(type: float(ratio)), engine(type: string),
+               workers(type: integer), timing(type: boolean)
+    Return value type: tuple(list[dictionary(key: tuple, value: float)], integer(number of transactions))
+'''
+def apriori(source, min_sup, engine='horizontal', workers=1, timing=False):
+    # Count items & transactions: one pass
+    counts, total = count_items(iter_patterns(source))
+    # Convert: ratio->count
+    min_cnt = total*min_sup
+    # Workers: each keeps fixed chunks of source
+    pools = start_counters(source, engine, workers) if workers > 1 else None
+    try:
+        # Frequent item sets: length 1
+        freq_list = [{(item_id,): cnt/total*100 for item_id, cnt in counts.items() if cnt >= min_cnt}]
+        # Create candidates depending on its length
+        while freq_list[-1]:
+            start = time.perf_counter()
+            cand = self_join(freq_list[-1], len(freq_list)+1)
+            tmp = prune(cand, source, min_cnt, total, engine, pools)
+            if timing and cand:
+                elapsed = time.perf_counter() - start
+                sys.stderr.write("length {}: {} candidates, {} frequent, {:.3f}s\n".format(len(cand[0]), len(cand), len(tmp), elapsed))
+            if not tmp:
+                break
+            freq_list.append(tmp)
+    finally:
+        for pool in pools or ():
+            pool.close()
+            pool.join()
+    return freq_list, total
+
+
+'''
+    Feature: Generate candidates by self-joining itemsets sharing (length-2)-prefix
+             & Remove candidates having infrequent (length-1)-subset(Apriori property)
     Arguments: itemdict(type: dictionary(key: tuple, value: float)), length(type: integer)
     Return value type: list[set]
 '''
 def self_join(itemdict,length):
-    # Convert type: tuple->set
-    itemsets = list(map(set,itemdict.keys()))
-    # Generate candidates by set union operator
-    ret = [itemsets[i]|itemsets[j] for i in range(len(itemsets)) for j in range(i+1,len(itemsets))]
-    # Filter by length
-    ret = list(filter(lambda x: len(x)==length, ret)) 
-    # Remove duplicates
-    ret = list(set(tuple(sorted(itemset)) for itemset in ret))
+    # Convert type: tuple->sorted tuple
+    itemsets = sorted(tuple(sorted(itemset)) for itemset in itemdict.keys())
+    frequent = set(itemsets)
+    ret = []
+    # Sorted itemsets sharing same prefix are adjacent
+    for i in range(len(itemsets)):
+        prefix = itemsets[i][:-1]
+        for j in range(i+1,len(itemsets)):
+            if itemsets[j][:-1] != prefix:
+                break
+            cand = itemsets[i] + itemsets[j][-1:]
+            # Check every (length-1)-subset is frequent
+            if all(cand[:k]+cand[k+1:] in frequent for k in range(length-2)):
+                ret.append(cand)
     # Convert type: tuple->set 
     ret = list(map(set,ret))
     return ret
 
 
 '''
-    Feature: Gerneate association rules
-    Arguments: freq_list(type: list[dictionary(key: tuple. value: float)])
-    Return value type: list[string] 
+    Feature: FP-tree node
+    [Type]
+        item: integer
+        count: integer
+        parent: FPNode
+        children: dictionary(key: integer, value: FPNode)
+'''
+class FPNode:
+    def __init__(self, item, parent):
+        self.item = item
+        self.count = 0
+        self.parent = parent
+        self.children = {}
+
+
+'''
+    Feature: Count items of patterns
+    Arguments: patterns(type: iterable(tuple(iterable, integer(count))))
+    Return value type: tuple(dictionary(key: integer, value: integer), integer(number of patterns))
+'''
+def count_items(patterns):
+    counts = {}
+    total = 0
+    for items, cnt in patterns:
+        total += cnt
+        for item_id in items:
+            counts[item_id] = counts.get(item_id, 0) + cnt
+    return counts, total
+
+
+'''
+    Feature: Build FP-tree by inserting frequent items of each pattern in descending frequency order
+    Arguments: patterns(type: iterable(tuple(iterable, integer(count)))), frequent(type: dictionary(key: integer, value: integer))
+    Return value type: dictionary(key: integer, value: list[FPNode])(header table)
+'''
+def build_fp_tree(patterns, frequent):
+    root = FPNode(None, None)
+    header = {item_id: [] for item_id in frequent}
+    for items, cnt in patterns:
+        path = sorted((item_id for item_id in items if item_id in frequent), key=lambda x: (-frequent[x], x))
+        node = root
+        for item_id in path:
+            if item_id not in node.children:
+                node.children[item_id] = FPNode(item_id, node)
+                header[item_id].append(node.children[item_id])
+            node = node.children[item_id]
+            node.count += cnt
+    return header
+
+
+'''
+    Feature: Mine frequent itemsets from FP-tree recursively by using conditional FP-trees
+    Arguments: header(type: dictionary(key: integer, value: list[FPNode])), frequent(type: dictionary(key: integer, value: integer)),
+               suffix(type: tuple), min_cnt(type: float), found(type: dictionary(key: tuple, value: integer))
+    Return value type: None
+'''
+def mine_fp_tree(header, frequent, suffix, min_cnt, found):
+    for item_id in frequent:
+        itemset = suffix + (item_id,)
+        found[itemset] = frequent[item_id]
+        # Conditional pattern base: prefix paths of item
+        base = []
+        for node in header[item_id]:
+            path = []
+            parent = node.parent
+            while parent.item is not None:
+                path.append(parent.item)
+                parent = parent.parent
+            if path:
+                base.append((path, node.count))
+        counts, _ = count_items(base)
+        cond_frequent = {key: val for key, val in counts.items() if val >= min_cnt}
+        if cond_frequent:
+            cond_header = build_fp_tree(base, cond_frequent)
+            mine_fp_tree(cond_header, cond_frequent, itemset, min_cnt, found)
+
+
+'''
+    Feature: Generate frequent item sets by FP-Growth(two passes over transactions)
+    Arguments: source(type: MemorySource or StreamSource), min_sup(type: float(ratio))
+    Return value type: tuple(list[dictionary(key: tuple, value: float)], integer(number of transactions))
+'''
+def fp_growth(source, min_sup):
+    # First pass: count items
+    counts, total = count_items(iter_patterns(source))
+    min_cnt = total*min_sup
+    frequent = {key: val for key, val in counts.items() if val >= min_cnt}
+    # Second pass: build FP-tree
+    header = build_fp_tree(iter_patterns(source), frequent)
+    found = {}
+    mine_fp_tree(header, frequent, (), min_cnt, found)
+    # Group by length
+    freq_list = [{} for _ in range(max(map(len, found), default=0))]
+    for itemset, cnt in found.items():
+        freq_list[len(itemset)-1][tuple(sorted(itemset))] = cnt/total*100
+    return freq_list, total
+
+
+'''
+    Feature: Build support count index of frequent item sets
+    Arguments: freq_list(type: list[dictionary(key: tuple. value: float)]), total(type: integer)
+    Return value type: dictionary(key: frozenset, value: integer)
 '''
-def generate_association_rule(freq_list):
+def build_support_index(freq_list, total):
+    # Convert: support(percentage)->count
+    return {frozenset(itemset): int(round(val*total/100)) for itemdict in freq_list for itemset, val in itemdict.items()}
+
+
+# Association rule: left -> right
+# support, confidence: percentage / lift: ratio
+Rule = namedtuple('Rule', ['left', 'right', 'support', 'confidence', 'lift'])
+
+
+'''
+    Feature: Generate association rules growing consequents level by level
+             & Stop growing consequents below minimum confidence(anti-monotone)
+             & Keep top-k rules by confidence or lift
+    Arguments: freq_list(type: list[dictionary(key: tuple. value: float)]), total(type: integer), min_conf(type: float(percentage)),
+               top_k(type: integer or None), sort_by(type: string('confidence' or 'lift'))
+    Return value type: list[Rule]
+'''
+def generate_rules(freq_list, total, min_conf=0.0, top_k=None, sort_by='confidence'):
     ret = []
+    # Exception: no rule is kept
+    if top_k == 0:
+        return ret
+    # Heap of top-k rules: (sort key, -order, rule)
+    heap = []
+    order = 0
+    # Every subset of frequent item set is frequent -> look up its count
+    support_index = build_support_index(freq_list, total)
     for itemdict in freq_list:
         for itemset,val in itemdict.items():
             # Exception: length is less or equal than 1
             if len(itemset) <= 1:
-                break
+                continue
             # Save support value
             sup = val
-            # Convert type: tuple->set 
-            itemset = set(itemset)
-            for length in range(1,len(itemset)):
-                # Generate all combinations
-                total_combinations = combinations(itemset,length)       
-                for combination in total_combinations:
-                    # Convert type: tuple->set 
-                    left = set(combination)
-                    right = itemset - left
-                    left_cnt=0
-                    for transaction in table:
-                        if transaction >= left:
-                            left_cnt += 1
-                    # Calculate confidence
-                    conf = sup*len(table)/left_cnt
-                    # Save result as string
-                    ret.append("{}\t{}\t{:.2f}\t{:.2f}\n".format(str(left),str(right),sup,conf))
+            # Convert type: tuple->frozenset
+            itemset = frozenset(itemset)
+            # Consequents: length 1
+            consequents = [{item_id} for item_id in itemset]
+            length = 1
+            while consequents and length < len(itemset):
+                passed = {}
+                for right in consequents:
+                    left = itemset - right
+                    # Calculate confidence & lift
+                    conf = sup*total/support_index[left]
+                    lift = conf/100*total/support_index[frozenset(right)]
+                    # Confidence of larger consequent cannot be higher -> stop growing
+                    keep = conf >= min_conf
+                    if top_k is not None and sort_by == 'confidence' and len(heap) == top_k:
+                        keep = keep and conf > heap[0][0]
+                    if not keep:
+                        continue
+                    passed[tuple(sorted(right))] = conf
+                    rule = Rule(set(left), set(right), sup, conf, lift)
+                    if top_k is None:
+                        ret.append(rule)
+                        continue
+                    # Older rule wins tie
+                    entry = (conf if sort_by == 'confidence' else lift, -order, rule)
+                    order += 1
+                    if len(heap) < top_k:
+                        heapq.heappush(heap, entry)
+                    elif entry[:2] > heap[0][:2]:
+                        heapq.heapreplace(heap, entry)
+                # Grow consequents whose every subset passed
+                length += 1
+                consequents = self_join(passed, length)
+    if top_k is not None:
+        ret = [rule for _, _, rule in sorted(heap, key=lambda x: x[:2], reverse=True)]
+    return ret
+
+
+'''
+    Feature: Gerneate association rules
+    Arguments: freq_list(type: list[dictionary(key: tuple. value: float)]), total(type: integer), min_conf(type: float(percentage)),
+               top_k(type: integer or None), sort_by(type: string)
+    Return value type: list[string] 
+'''
+def generate_association_rule(freq_list, total, min_conf=0.0, top_k=None, sort_by='confidence'):
+    # Save result as string
+    return ["{}\t{}\t{:.2f}\t{:.2f}\n".format(str(rule.left),str(rule.right),rule.support,rule.confidence)
+            for rule in generate_rules(freq_list, total, min_conf, top_k, sort_by)]
+
+
+'''
+    Feature: Generate frequent item sets from transactions in memory
+    Arguments: transactions(type: iterable(iterable[integer]) or MemorySource or StreamSource), min_sup(type: float(ratio)),
+               algorithm(type: string('apriori' or 'fpgrowth')), engine(type: string), workers(type: integer), chunk_size(type: integer)
+    Return value type: tuple(list[dictionary(key: tuple, value: float)], integer(number of transactions))
+'''
+def mine_itemsets(transactions, min_sup, algorithm='apriori', engine='horizontal', workers=1, chunk_size=100000):
+    if isinstance(transactions, (MemorySource, StreamSource)):
+        source = transactions
+    else:
+        source = MemorySource(transactions, chunk_size)
+    if algorithm == 'fpgrowth':
+        return fp_growth(source, min_sup)
+    return apriori(source, min_sup, engine, workers)
+
+
+'''
+    Feature: Parse non-negative integer argument
+    Arguments: value(type: string)
+    Return value type: integer
+'''
+def non_negative_int(value):
+    ret = int(value)
+    if ret < 0:
+        raise argparse.ArgumentTypeError("{} is negative".format(value))
     return ret
 
 
@@ -77,57 +590,68 @@ if __name__ == "__main__":
     '''
         Initialize arguments
         [Type]
-            min_sup: float(ratio)->integer(count)
+            min_sup: float(ratio)
             input_file: string
             output_file: string
+            algorithm: string
+            engine: string
+            stream: boolean
+            chunk_size: integer
+            workers: integer
+            timing: boolean
+            min_conf: float(percentage)
+            top_k: integer
+            sort_by: string
     '''
+    # Parse arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument("min_sup", type=float)
+    parser.add_argument("input_file", type=str)
+    parser.add_argument("output_file", type=str)
+    parser.add_argument("--algorithm", type=str, choices=["apriori", "fpgrowth"], default="apriori")
+    parser.add_argument("--engine", type=str, choices=sorted(ENGINES), default="horizontal")
+    parser.add_argument("--stream", action="store_true", help="re-read input file chunk by chunk at every pass instead of loading it")
+    parser.add_argument("--chunk-size", type=int, default=100000, help="number of transactions per chunk")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes counting support")
+    parser.add_argument("--timing", action="store_true", help="print counting time of each level")
+    parser.add_argument("--min-conf", type=float, default=0.0, help="minimum confidence(percentage)")
+    parser.add_argument("--top-k", type=non_negative_int, default=None, help="keep k best rules only")
+    parser.add_argument("--sort-by", type=str, choices=["confidence", "lift"], default="confidence")
+    args = parser.parse_args()
     # Save command line argument
-    min_sup, input_file, output_file = sys.argv[1:]
-    # Convert type: string->float
-    min_sup = float(min_sup)/100
+    input_file, output_file = args.input_file, args.output_file
+    # Convert: percentage->ratio
+    min_sup = args.min_sup/100
 
     ''' 
-        Read input file
-        & Create transaction table
+        Create transaction source
         [Type]
-            table: list[sorted sets]
+            source: MemorySource(list[list[array]]) or StreamSource(input file)
     '''
-    with open(input_file, 'r') as f:
-        table = [set(sorted(map(int,line.split()))) for line in f.readlines()]
-
-    # Convert: ratio->count
-    min_sup = len(table)*min_sup
+    if args.stream:
+        source = StreamSource(input_file, args.chunk_size)
+    else:
+        source = MemorySource(read_transactions(input_file), args.chunk_size)
 
     '''
-        Generate candidates(Self-joining)
-        & Prune candidates
-        => Generate frequent item sets depending on its length
+        Generate frequent item sets
         [Type]
-            itmes: set
-            cand_list: list[list[set]] 
             freq_list: list[dictionary(key:tuple, value=float(support))]
-            max_length: integer
+            total: integer(number of transactions)
     '''
-    # Create candidates: length 1
-    items = {item_id for transaction in table for item_id in transaction} 
-    cand_list = [[{item_id} for item_id in items]]
-    freq_list = [prune(cand_list[0])]
-    max_length = 1
-    # Create candidates depending on its length
-    while True:
-        cand_list.append(self_join(freq_list[-1],max_length+1))
-        tmp = prune(cand_list[-1])
-        if not tmp:
-            break
-        freq_list.append(tmp)
-        max_length += 1
+    if args.algorithm == 'fpgrowth':
+        # FP-Growth: build FP-tree & mine conditional FP-trees
+        freq_list, total = fp_growth(source, min_sup)
+    else:
+        # Apriori: self-join & prune candidates level by level
+        freq_list, total = apriori(source, min_sup, args.engine, args.workers, args.timing)
 
     '''
         Generate association rules
         [Type]
             association_list: list[string]
     '''
-    association_list = generate_association_rule(freq_list)
+    association_list = generate_association_rule(freq_list, total, args.min_conf, args.top_k, args.sort_by)
     # Write results in output file 
     with open(output_file, 'w') as f:
         for line in association_list:
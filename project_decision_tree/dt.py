@@ -1,7 +1,17 @@
-import sys
+import argparse
+import json
+import struct
 from math import log
+from multiprocessing import Pool, shared_memory
+import numpy as np
 import pandas as pd
 
+# Model file: magic, format version, header length, JSON header, 8-byte aligned arrays
+MODEL_MAGIC = b"DTRE"
+MODEL_VERSION = 1
+MODEL_PREFIX = struct.Struct("<4sII")
+MODEL_ARRAYS = ("node_attribute", "node_class", "node_offset", "child_table")
+
 class TreeNode:
     def __init__(self, attribute, isleaf=False, metric=None):
         self.attribute = attribute
@@ -10,20 +20,94 @@ class TreeNode:
         self.metric = metric
 
 
+# Tree of pool worker: encoded matrix attached from shared memory
+worker_tree = None
+
+
+def init_worker(state, blocks):
+    global worker_tree
+    worker_tree = DecisionTree.__new__(DecisionTree)
+    worker_tree.__dict__.update(state)
+    # Keep shared memory blocks referenced while worker lives
+    worker_tree.blocks = []
+    for name, (shm_name, shape, dtype, order) in blocks.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        worker_tree.blocks.append(shm)
+        setattr(worker_tree, name, np.ndarray(shape, dtype=dtype, buffer=shm.buf, order=order))
+
+
+# Contingency tables & scores of attribute positions js on rows
+def score_attributes(task):
+    rows, js = task
+    ret = []
+    for j in js:
+        table = worker_tree._get_contingency_table(rows, j)
+        ret.append((table, worker_tree._score_attribute(table)))
+    return ret
+
+
+def build_subtree(rows):
+    return worker_tree._build_tree_index(rows)
+
+
 class DecisionTree:
-    def __init__(self, df, metric_type):
+    def __init__(self, df, metric_type, build_mode="index", branch_search="prefix", max_exhaustive=10, n_jobs=1, min_parallel_rows=50000):
         self.metric_type = metric_type
+        # Branch search: "prefix"(prefix splits of values) or "optimal"(groupings from per-value class counts)
+        self.branch_search = branch_search
+        self.max_exhaustive = max_exhaustive
+        # Index mode with n_jobs > 1: nodes of at least min_parallel_rows rows score attributes in pool, smaller subtrees are built in pool
+        self.n_jobs = n_jobs
+        self.min_parallel_rows = min_parallel_rows
         self.label = df.columns[-1]
-        self.attribute_dict = {attribute: df[attribute].unique() for attribute in df.columns if attribute!=self.label}
-        self.root =  self._build_tree(df)
+        # Position of each row = index of data set
+        df = df.reset_index(drop=True)
+        self.attributes = [attribute for attribute in df.columns if attribute!=self.label]
+        self.attribute_dict = {attribute: df[attribute].unique() for attribute in self.attributes}
+        # Integer-encoded matrix(column major): code denotes position in attribute_dict[attribute] (class: position in classes)
+        # Missing value(NaN) is one more value of attribute(or class)
+        self.classes = df[self.label].unique()
+        codes = [self._get_codes(df[attribute], self.attribute_dict[attribute]) for attribute in self.attributes]
+        self.matrix = np.asfortranarray(np.stack(codes, axis=1).astype(np.int32))
+        self.label_codes = self._get_codes(df[self.label], self.classes).astype(np.int32)
+        # Majority class of training data
+        self.majority = df[self.label].value_counts().sort_values(ascending=False).index[0]
+
+        # Index mode: recurse on row index arrays of encoded matrix
+        if build_mode == "index":
+            if self.n_jobs > 1 and len(df) >= self.min_parallel_rows:
+                self.root = self._build_tree_parallel(np.arange(len(df)))
+            else:
+                self.root = self._build_tree_index(np.arange(len(df)))
+        # DataFrame mode: recurse on filtered data frames
+        else:
+            self.root =  self._build_tree(df)
+        self._compile_tree()
 
 
-    # Calculate Info(D) when D is given (D denotes data set)
+    # Position of each value in values of training data(-1: unseen value), NaN matches NaN
+    @staticmethod
+    def _get_codes(values, categories):
+        return pd.Index(categories).get_indexer(values)
+
+
+    # Contingency table: (attribute value x class) counts of rows
+    def _get_contingency_table(self, rows, j):
+        n_class = len(self.classes)
+        n_atype = len(self.attribute_dict[self.attributes[j]])
+        cell = self.matrix[rows, j]*n_class + self.label_codes[rows]
+        return np.bincount(cell, minlength=n_atype*n_class).reshape(n_atype, n_class)
+
+
+    # Calculate Info(D) when class counts of D are given (D denotes data set)
     # Info(D) = -sigma[p(i)*log2(p(i))] 1 to m (m denotes number of class labels)
-    def _calculate_entropy(self, data_set):
-        total = len(data_set)
+    def _calculate_entropy(self, class_counts):
+        total = sum(class_counts)
         ret = 0.0
-        for _,val in data_set[self.label].value_counts().iteritems():
+        # Same order as value_counts(): descending
+        for val in sorted(class_counts, reverse=True):
+            if val == 0:
+                continue
             p_val = val/total
             # Avoid log2(0)
             ret += -p_val*log(p_val+1e-7,2)
@@ -33,24 +117,24 @@ class DecisionTree:
     # Calculate Information Gain
     # Calculate InfoA(D) when D and attribute are given (D denotes data set)
     # InfoA(D) = sigma[|D(j)|/|D|*Info(D(j)] (|D| denotes size of data set)
-    def _calculate_information_gain(self, data_set, attribute):
+    def _calculate_information_gain(self, table):
         ret = 0.0
-        info_D = self._calculate_entropy(data_set)
-        for atype in self.attribute_dict[attribute]:
-            df_filtered = data_set[data_set[attribute]==atype]
-            info_att = self._calculate_entropy(df_filtered)
-            ret += info_att*(len(df_filtered)/len(data_set))
+        total = int(table.sum())
+        info_D = self._calculate_entropy(table.sum(axis=0).tolist())
+        for class_counts in table.tolist():
+            info_att = self._calculate_entropy(class_counts)
+            ret += info_att*(sum(class_counts)/total)
 
         return info_D - ret
 
 
     # Calculate split info
     # SplitInfoA(D) = -sigma[|D(j)|/|D|*log2(|D(j)|/|D|)] (|D| denotes size of data set)
-    def _calculate_split_info(self, data_set, attribute):
+    def _calculate_split_info(self, table):
         ret = 0.0
-        for atype in self.attribute_dict[attribute]:
-            df_filtered = data_set[data_set[attribute]==atype]
-            partial = len(df_filtered)/len(data_set)
+        total = int(table.sum())
+        for size in table.sum(axis=1).tolist():
+            partial = size/total
             log_val = log(partial+1e-7,2)
             # Avoid log2(0)
             ret += -1.0*(partial*log_val)
@@ -60,73 +144,138 @@ class DecisionTree:
         
     # Calculate Gain Ratio
     # GainRatio(A) = Gain(A) / SplitInfo(A)
-    def _calculate_gain_ratio(self, data_set, attribute):
-        gain = self._calculate_information_gain(data_set,attribute)
-        split_info = self._calculate_split_info(data_set,attribute)
+    def _calculate_gain_ratio(self, table):
+        gain = self._calculate_information_gain(table)
+        split_info = self._calculate_split_info(table)
 
         return gain/split_info
 
 
-    # Calculate Gini(D)
-    def _calculate_gini(self, data_set):
+    # Calculate Gini(D) when class counts of D are given
+    def _calculate_gini(self, class_counts):
         ret = 1.0
-        total = len(data_set)
-        for _,val in data_set[self.label].value_counts().iteritems():
+        total = sum(class_counts)
+        # Same order as value_counts(): descending
+        for val in sorted(class_counts, reverse=True):
+            if val == 0:
+                continue
             partial = val/total
             ret -= partial**2
 
         return ret
 
 
-    # Calculate GiniA(D)
-    def _calculate_gini_index(self, data_set, attribute, left, right):
-        total = len(data_set)
+    # Calculate GiniA(D) when class counts of left & right partitions are given
+    def _calculate_gini_index(self, left_counts, right_counts):
+        total = sum(left_counts) + sum(right_counts)
         # Left
-        df_left = data_set[data_set[attribute].isin(left)]
-        left_scale = len(df_left)/total
-        left_gini = self._calculate_gini(df_left)
+        left_scale = sum(left_counts)/total
+        left_gini = self._calculate_gini(left_counts)
         # Right
-        df_right = data_set[data_set[attribute].isin(right)]
-        right_scale = len(df_right)/total
-        right_gini = self._calculate_gini(df_right)
+        right_scale = sum(right_counts)/total
+        right_gini = self._calculate_gini(right_counts)
 
         return left_scale*left_gini + right_scale*right_gini 
 
 
-    def _choose_branch(self, data_set, attribute):
+    def _choose_branch(self, table, attribute):
+        if self.branch_search == "optimal":
+            return self._choose_branch_optimal(table, attribute)
         atypes = self.attribute_dict[attribute]
         gini_dict = {}
         for i in range(1,len(atypes)):
             left = tuple(atypes[:i])
             right = tuple(atypes[i:])
-            gini_dict[(left,right)] = self._calculate_gini_index(data_set, attribute, left, right)
+            gini_dict[(left,right)] = self._calculate_gini_index(table[:i].sum(axis=0).tolist(), table[i:].sum(axis=0).tolist())
         # Sort dictionary by value: ascending -> tuple((left,right), gini index)
         return sorted(gini_dict.items(),key=lambda x: x[1], reverse=False)[0][0]
 
 
+    # Best prefix split of values in given order: (gini index, left codes)
+    def _best_prefix_split(self, table, order):
+        best = None
+        left_counts = np.zeros(table.shape[1], dtype=np.int64)
+        total_counts = table[order].sum(axis=0)
+        for i in range(1,len(order)):
+            left_counts += table[order[i-1]]
+            gini = self._calculate_gini_index(left_counts.tolist(), (total_counts-left_counts).tolist())
+            if best is None or gini < best[0]:
+                best = (gini, order[:i])
+        return best
+
+
+    # Choose binary grouping of values from per-value class counts
+    # Two classes: prefix splits of values sorted by class proportion include optimal grouping
+    # More classes: every grouping up to max_exhaustive values, otherwise prefix splits of values sorted by each class proportion
+    def _choose_branch_optimal(self, table, attribute):
+        atypes = self.attribute_dict[attribute]
+        sizes = table.sum(axis=1)
+        present = [code for code in range(len(atypes)) if sizes[code] > 0]
+        class_columns = np.flatnonzero(table.sum(axis=0))
+        n_class = len(class_columns)
+
+        if len(present) <= 1:
+            best = (None, present)
+        elif n_class <= 2 or len(present) > self.max_exhaustive:
+            best = None
+            ratio = table[present] / sizes[present, None]
+            # Two classes: proportion of one class orders values completely
+            for c in (class_columns[:1] if n_class <= 2 else class_columns):
+                # Stable sort: ties keep value order
+                order = [present[i] for i in np.argsort(ratio[:, c], kind="stable")]
+                split = self._best_prefix_split(table, order)
+                if best is None or split[0] < best[0]:
+                    best = split
+        else:
+            best = None
+            total_counts = table.sum(axis=0)
+            # Groupings containing first value: 2^(k-1) - 1
+            for mask in range(1 << (len(present)-1)):
+                left = [present[0]] + [code for i, code in enumerate(present[1:]) if mask >> i & 1]
+                if len(left) == len(present):
+                    continue
+                left_counts = table[left].sum(axis=0)
+                gini = self._calculate_gini_index(left_counts.tolist(), (total_counts-left_counts).tolist())
+                if best is None or gini < best[0]:
+                    best = (gini, left)
+
+        left = set(best[1])
+        right = [code for code in present if code not in left]
+        # Values absent from data set follow larger branch
+        absent = [code for code in range(len(atypes)) if sizes[code] == 0]
+        if sizes[list(left)].sum() >= sizes[right].sum():
+            left |= set(absent)
+        else:
+            right += absent
+        return tuple(atypes[code] for code in sorted(left)), tuple(atypes[code] for code in sorted(right))
+
+
     def _majority_vote(self, data_set):
-        major = df_train[self.label].value_counts().sort_values(ascending=False)
-        return major.index[0]
+        return self.majority
 
 
-    # Select best attribute
-    def _select_attribute(self, data_set):
+    # Score of attribute from its contingency table
+    def _score_attribute(self, table):
         # Type 0: Use information gain
         if self.metric_type == 0:
-            info_dict = {attribute: self._calculate_information_gain(data_set,attribute) for attribute in data_set.columns if attribute!=self.label}
-            # Sort dictionary by value: descending -> tuple(attribute, information gain)
-            return sorted(info_dict.items(),key=lambda x: x[1], reverse=True)[0][0]
+            return self._calculate_information_gain(table)
 
         # Type 1: Use gain ratio 
         elif self.metric_type == 1:
-            ratio_dict = {attribute: self._calculate_gain_ratio(data_set,attribute) for attribute in data_set.columns if attribute!=self.label}
-            # Sort dictionary by value: descending -> tuple(attribute, gain ratio) 
-            return  sorted(ratio_dict.items(),key=lambda x: x[1], reverse=True)[0][0]
+            return self._calculate_gain_ratio(table)
+
+
+    # Select best attribute
+    def _select_attribute(self, tables, scores=None):
+        if scores is None:
+            scores = {attribute: self._score_attribute(table) for attribute, table in tables.items()}
+        # Sort dictionary by value: descending -> tuple(attribute, score)
+        return sorted(scores.items(),key=lambda x: x[1], reverse=True)[0][0]
 
 
     # Build node by using selected attribute
-    def _build_node(self, data_set):
-        target_att = self._select_attribute(data_set)
+    def _build_node(self, tables, scores=None):
+        target_att = self._select_attribute(tables, scores)
         return TreeNode(target_att)
 
     
@@ -143,12 +292,15 @@ class DecisionTree:
             major = self._majority_vote(data_set)
             return TreeNode(None,True,major)
 
+        # Contingency table of each attribute: computed once per node
+        rows = data_set.index.to_numpy()
+        tables = {attribute: self._get_contingency_table(rows, j) for j, attribute in enumerate(self.attributes)}
         # Build node & choose attribute
-        node = self._build_node(data_set)
+        node = self._build_node(tables)
         # For post pruning
         node.metric = self._majority_vote(data_set) 
         # Choose proper branch by using gini index -> binary tree
-        for branch in self._choose_branch(data_set, node.attribute):
+        for branch in self._choose_branch(tables[node.attribute], node.attribute):
             #df_filtered = data_set[data_set[node.attribute].isin(branch)].drop(node.attribute, axis=1)
             df_filtered = data_set[data_set[node.attribute].isin(branch)]
             if len(df_filtered) > 0:
@@ -160,6 +312,82 @@ class DecisionTree:
         return node
 
 
+    # Build tree in process pool over encoded matrix in shared memory
+    def _build_tree_parallel(self, rows):
+        state = {key: value for key, value in self.__dict__.items() if key not in ("matrix", "label_codes")}
+        blocks = {}
+        shms = []
+        try:
+            for name, order in (("matrix", "F"), ("label_codes", "C")):
+                array = getattr(self, name)
+                shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                shms.append(shm)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf, order=order)[...] = array
+                blocks[name] = (shm.name, array.shape, array.dtype.str, order)
+
+            with Pool(self.n_jobs, initializer=init_worker, initargs=(state, blocks)) as pool:
+                pending = []
+                root = self._build_tree_index(rows, pool, pending)
+                # Attach subtrees built by workers
+                for node, branch, result in pending:
+                    node.child[branch] = result.get()
+            return root
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
+
+
+    # Contingency tables & scores of large node: attributes split among workers
+    def _get_tables_parallel(self, rows, pool):
+        chunks = [(rows, js) for js in np.array_split(np.arange(len(self.attributes)), self.n_jobs) if len(js) > 0]
+        results = [item for chunk in pool.map(score_attributes, chunks) for item in chunk]
+        tables = {attribute: table for attribute, (table, _) in zip(self.attributes, results)}
+        scores = {attribute: score for attribute, (_, score) in zip(self.attributes, results)}
+        return tables, scores
+
+
+    # Build tree on row index array
+    # pool: node is built in main process(parallel scoring), children below min_parallel_rows are queued on pending
+    def _build_tree_index(self, rows, pool=None, pending=None):
+        # Data is classified perfectly
+        class_counts = np.bincount(self.label_codes[rows], minlength=len(self.classes))
+        if np.count_nonzero(class_counts) == 1:
+            uval = self.classes[self.label_codes[rows[0]]]
+            return TreeNode(None,True,uval)
+
+        # There are no remaining attributes -> majority voting
+        elif len(self.attributes) == 0:
+            return TreeNode(None,True,self.majority)
+
+        # Contingency table of each attribute: computed once per node
+        if pool is None:
+            tables, scores = {attribute: self._get_contingency_table(rows, j) for j, attribute in enumerate(self.attributes)}, None
+        else:
+            tables, scores = self._get_tables_parallel(rows, pool)
+        # Build node & choose attribute
+        node = self._build_node(tables, scores)
+        # For post pruning
+        node.metric = self.majority
+        # Choose proper branch by using gini index -> binary tree
+        j = self.attributes.index(node.attribute)
+        left, right = self._choose_branch(tables[node.attribute], node.attribute)
+        # Left branch membership of each code
+        in_left = pd.Index(self.attribute_dict[node.attribute]).isin(left)
+        is_left = in_left[self.matrix[rows, j]]
+        for branch, sub_rows in ((left, rows[is_left]), (right, rows[~is_left])):
+            if len(sub_rows) > 0 and pool is not None and len(sub_rows) < self.min_parallel_rows:
+                # Placeholder until worker returns subtree
+                node.child[tuple(branch)] = None
+                pending.append((node, tuple(branch), pool.apply_async(build_subtree, (sub_rows,))))
+            elif len(sub_rows) > 0:
+                node.child[tuple(branch)] = self._build_tree_index(sub_rows, pool, pending)
+            # There are no remaining tuples -> majority voting
+            else:
+                node.child[tuple(branch)] = TreeNode(None,True,self.majority)
+        return node
+
+
     # Tree traversal
     def _traverse_tree(self, tuple_data):
         node = self.root
@@ -176,20 +404,149 @@ class DecisionTree:
         return node.metric
 
 
+    # Flat arrays of tree(preorder node id)
+    # node_attribute: attribute position(-1: leaf), node_class: class position of leaf
+    # child_table[node_offset[node] + code]: child of value code(last slot: value unseen in training)
+    def _compile_tree(self):
+        nodes = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(reversed(list(node.child.values())))
+        node_id = {id(node): i for i, node in enumerate(nodes)}
+        class_code = {cls: i for i, cls in enumerate(self.classes)}
+
+        self.node_attribute = np.full(len(nodes), -1, dtype=np.int32)
+        self.node_class = np.full(len(nodes), -1, dtype=np.int32)
+        self.node_offset = np.zeros(len(nodes), dtype=np.int64)
+        child_table = []
+        for i, node in enumerate(nodes):
+            if node.isleaf:
+                self.node_class[i] = class_code[node.metric]
+                continue
+            self.node_attribute[i] = self.attributes.index(node.attribute)
+            self.node_offset[i] = len(child_table)
+            # Value in no branch follows last branch(as _traverse_tree)
+            children = list(node.child.items())
+            for atype in self.attribute_dict[node.attribute]:
+                child = next((nxt for branch, nxt in children if atype in branch), children[-1][1])
+                child_table.append(node_id[id(child)])
+            child_table.append(node_id[id(children[-1][1])])
+        self.child_table = np.array(child_table, dtype=np.int32)
+
+
+    # Encode data set by training codes: unseen value -> number of training values
+    def _encode(self, data_set):
+        codes = np.empty((len(data_set), len(self.attributes)), dtype=np.int32, order="F")
+        for j, attribute in enumerate(self.attributes):
+            code = self._get_codes(data_set[attribute], self.attribute_dict[attribute])
+            codes[:, j] = np.where(code < 0, len(self.attribute_dict[attribute]), code)
+        return codes
+
+
+    # Batch prediction: route every row through flat arrays level by level
+    def predict(self, data_set):
+        codes = self._encode(data_set)
+        cur = np.zeros(len(codes), dtype=np.int32)
+        active = np.arange(len(codes))
+        while len(active) > 0:
+            nodes = cur[active]
+            internal = self.node_attribute[nodes] >= 0
+            active, nodes = active[internal], nodes[internal]
+            cur[active] = self.child_table[self.node_offset[nodes] + codes[active, self.node_attribute[nodes]]]
+        return self.classes[self.node_class[cur]]
+
+
+    # Save compiled tree: value dictionaries in header, node table as raw arrays
+    def save(self, model_file):
+        header = {
+            "label": self.label,
+            "attributes": self.attributes,
+            "attribute_dict": [self.attribute_dict[attribute].tolist() for attribute in self.attributes],
+            "classes": self.classes.tolist(),
+            "arrays": [],
+        }
+        offset = 0
+        for name in MODEL_ARRAYS:
+            array = getattr(self, name)
+            header["arrays"].append([name, array.dtype.str, len(array), offset])
+            offset += (array.nbytes + 7) // 8 * 8
+        encoded = json.dumps(header).encode("utf-8")
+        # Arrays start at 8-byte boundary
+        start = (MODEL_PREFIX.size + len(encoded) + 7) // 8 * 8
+
+        with open(model_file, 'wb') as f:
+            f.write(MODEL_PREFIX.pack(MODEL_MAGIC, MODEL_VERSION, len(encoded)))
+            f.write(encoded)
+            for name, dtype, length, offset in header["arrays"]:
+                f.seek(start + offset)
+                f.write(getattr(self, name).tobytes())
+            f.truncate(start + offset + (length * np.dtype(dtype).itemsize + 7) // 8 * 8)
+
+
+    # Load saved tree without training: node table is memory-mapped
+    @classmethod
+    def load(cls, model_file):
+        with open(model_file, 'rb') as f:
+            magic, version, length = MODEL_PREFIX.unpack(f.read(MODEL_PREFIX.size))
+            if magic != MODEL_MAGIC:
+                raise ValueError("{} is not a decision tree model".format(model_file))
+            if version != MODEL_VERSION:
+                raise ValueError("unsupported model version {} (expected {})".format(version, MODEL_VERSION))
+            header = json.loads(f.read(length).decode("utf-8"))
+        start = (MODEL_PREFIX.size + length + 7) // 8 * 8
+
+        dt = cls.__new__(cls)
+        dt.root = None
+        dt.label = header["label"]
+        dt.attributes = header["attributes"]
+        dt.attribute_dict = {attribute: np.array(values, dtype=object) for attribute, values in zip(dt.attributes, header["attribute_dict"])}
+        dt.classes = np.array(header["classes"], dtype=object)
+        for name, dtype, length, offset in header["arrays"]:
+            # Empty array cannot be mapped
+            if length == 0:
+                array = np.zeros(0, dtype=dtype)
+            else:
+                array = np.memmap(model_file, dtype=dtype, mode='r', offset=start+offset, shape=(length,))
+            setattr(dt, name, array)
+        return dt
+
+
     # output
     def output(self, data_set):
-        label = [self._traverse_tree(data_set.loc[idx]) for idx in range(len(data_set))]
-        data_set[self.label] = label
+        data_set[self.label] = self.predict(data_set)
         return data_set
 
 
 if __name__ == "__main__":
-    train_file, test_file, output_file = sys.argv[1:]
-    df_train = pd.read_csv(train_file, sep="\t")
+    # Parse arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument("files", type=str, nargs="+", metavar="file", help="train_file test_file output_file, or test_file output_file with --load-model")
+    parser.add_argument("--branch-search", type=str, choices=["prefix", "optimal"], default="prefix")
+    parser.add_argument("--max-exhaustive", type=int, default=10, help="largest number of values tried with every grouping when more than two classes")
+    parser.add_argument("--n-jobs", type=int, default=1, help="number of processes building tree")
+    parser.add_argument("--min-parallel-rows", type=int, default=50000, help="nodes with fewer rows are built serially")
+    parser.add_argument("--save-model", type=str, help="save trained tree to model file")
+    parser.add_argument("--load-model", type=str, help="score test file with saved tree instead of training")
+    args = parser.parse_args()
+
+    if args.load_model:
+        if len(args.files) != 2:
+            parser.error("--load-model takes test_file output_file")
+        test_file, output_file = args.files
+        dt = DecisionTree.load(args.load_model)
+    else:
+        if len(args.files) != 3:
+            parser.error("expected train_file test_file output_file")
+        train_file, test_file, output_file = args.files
+        df_train = pd.read_csv(train_file, sep="\t")
+        # Attribute selection: information gain
+        # Branch selection: gini index
+        dt = DecisionTree(df_train, 0, branch_search=args.branch_search, max_exhaustive=args.max_exhaustive, n_jobs=args.n_jobs, min_parallel_rows=args.min_parallel_rows)
+        if args.save_model:
+            dt.save(args.save_model)
     df_test = pd.read_csv(test_file, sep="\t")
-    # Attribute selection: information gain
-    # Branch selection: gini index
-    dt = DecisionTree(df_train,0)
     
     ret = dt.output(df_test)
     ret.to_csv(output_file, sep="\t")
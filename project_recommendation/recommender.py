@@ -1,4 +1,47 @@
 import argparse
+import json
+import os
+import struct
+from multiprocessing import Pool, shared_memory
+import numpy as np
+from scipy import sparse
+
+# Model file: magic, format version, header length, JSON header, 8-byte aligned arrays
+MODEL_MAGIC = b"CFMD"
+MODEL_VERSION = 3
+MODEL_PREFIX = struct.Struct("<4sII")
+
+# Recommender of pool worker: ratings attached from shared memory
+worker_recommender = None
+
+
+def init_worker(similarity, blocks, shape):
+    global worker_recommender
+    worker_recommender = Recommender.__new__(Recommender)
+    worker_recommender.similarity = similarity
+    # Keep shared memory blocks referenced while worker lives
+    worker_recommender.blocks = []
+    arrays = []
+    for shm_name, length, dtype in blocks:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        worker_recommender.blocks.append(shm)
+        arrays.append(np.ndarray((length,), dtype=dtype, buffer=shm.buf))
+    worker_recommender.shared_ratings = sparse.csr_matrix(tuple(arrays), shape=shape)
+
+
+def similarity_block(task):
+    start, end = task
+    return worker_recommender._get_similarity_block(worker_recommender.shared_ratings, start, end)
+
+
+# Ratings file: [(user id, item id, rating) ...]
+def read_ratings(file_name):
+    ret = []
+    with open(file_name, 'r') as f:
+        for line in f.readlines():
+            user_id, item_id, rating, _ = map(int,line.split())
+            ret.append((user_id, item_id, rating))
+    return ret
 
 
 class Recommender:
@@ -7,16 +50,22 @@ class Recommender:
         self.output = args.training_file + "_prediction.txt"
 
         # Training data(User): {'user id': {'item id': rating ...} ...}
-        # Training data(Item): {'item id': {'user id': rating ...} ...}
-        # User average rating: {'user id': average value ...}
-        # Item average rating: {'item id': average value ...}
         self.training_user = {}
-        self.training_item = {}
-        self.user_avg = {}
-        self.item_avg = {}
 
-        # Use user based only
-        self.metric = 1
+        # 1: User based, 2: Item based
+        self.metric = 1 if args.mode == "user" else 2
+        # Similarity: "cosine" or "pcc"(over co-rated items)
+        self.similarity = args.similarity
+        # Neighborhood: keep top-k similar users per user or items per item(0: every user / every co-rated item)
+        self.neighbors = args.neighbors
+        # Significance weighting of top-k ranking: similarity over fewer co-rated items than significance is scaled down(0: similarity only)
+        self.significance = args.significance
+        # Prediction of every user mode: "batch"(grouped by item) or "loop"(pair by pair)
+        self.prediction = args.prediction
+        # Number of processes computing similarity
+        self.workers = args.workers
+        # Keep co-rated sums of every pair for update: memory & model size O(co-rated pairs)
+        self.updatable = args.updatable
 
         with open(args.training_file, 'r') as f:
             for line in f.readlines():
@@ -26,40 +75,32 @@ class Recommender:
                     self.training_user[user_id] = {item_id: rating}
                 else:    
                     self.training_user[user_id][item_id] = rating 
-                
-                # User avg rating
-                if user_id not in self.user_avg:
-                    self.user_avg[user_id] = [rating]
-                else:
-                    self.user_avg[user_id].append(rating)
 
-                # In case of using item based
-                if self.metric != 1:
-                    # Item
-                    if item_id not in self.training_item:
-                        self.training_item[item_id] = {user_id: rating}
-                    else:
-                        self.training_item[item_id][user_id] = rating
-
-                    # Item avg rating
-                    if item_id not in self.item_avg:
-                        self.item_avg[item_id] = [rating]
-                    else:
-                        self.item_avg[item_id].append(rating)
-
-        # Process user average value
-        for uid in self.user_avg.keys():
-            self.user_avg[uid] = sum(self.user_avg[uid]) / len(self.user_avg[uid])
-
-        # In case of using item based
-        if self.metric != 1:
-            # Process item average value
-            for iid in self.item_avg.keys():
-                self.item_avg[iid] = sum(self.item_avg[iid]) / len(self.item_avg[iid])
+        # CSR rating matrix(User x Item), rating sums & counts
+        self._get_rating_matrix()
+
+        # Co-rated sums of every pair of users(items in case of using item based)
+        self._get_pairs()
+
+        # In case of using item based or top-k: compact neighbor arrays(sparse)
+        if self.metric != 1 or self.neighbors:
+            self._get_neighbors()
+        else:
+            # Get rating matrix(User) values
+            self._get_user_matrix(self.pair_rows, self.pair_cols, self._get_pair_similarity(self.pair_acc))
+
+        # Not updatable: drop pair sums, neighbors(or rating matrix) are kept only
+        if not self.updatable:
+            self.pair_rows = self.pair_cols = self.pair_acc = None
+
+        self.recommend(args.test_file, self.output)
 
+
+    # Predict test file with trained model & save prediction data
+    def recommend(self, test_file, output):
         # Test data: {'user id': {'item id': rating ...} ...}
         self.test = {}
-        with open(args.test_file, 'r') as f:
+        with open(test_file, 'r') as f:
             for line in f.readlines():
                 user_id, item_id, _, _ = map(int,line.split())
                 if user_id not in self.test:
@@ -67,27 +108,271 @@ class Recommender:
                 else:
                     self.test[user_id][item_id] = 0
 
-        # Rating matrix(User): {'user id': {'user id': similarity ...} ...}
-        self.user_matrix = {i: {j: 0.0 for j in self.training_user.keys()} for i in self.training_user.keys()}
-
-        # In case of using item based
-        if self.metric != 1:
-            # Rating matrix(Item): {'item id': {'item id': similarity ...} ...}
-            self.item_matrix = {i: {j: 0.0 for j in self.training_item.keys()} for i in self.training_item.keys()}
-
-        # Get rating matrix(User) values
-        self._get_user_matrix()
-
-        # In case of using item based
-        if self.metric != 1:
-            # Get rating matrix(Item) values
-            self._get_item_matrix()
-
         # Predict: weighted average
         self._predict()
 
         # Save prediction data 
-        self._write()
+        self._write(output)
+
+
+    # Save model: settings in header, ratings, sums, similarities & pair sums(updatable only) as raw arrays
+    def save(self, model_file):
+        arrays = {
+            "user_ids": np.array(self.user_ids, dtype=np.int64),
+            "item_ids": np.array(self.item_ids, dtype=np.int64),
+            "ratings_data": self.ratings.data,
+            "ratings_indices": self.ratings.indices,
+            "ratings_indptr": self.ratings.indptr,
+            "user_sum": self.user_sum,
+            "user_count": self.user_count,
+            "item_sum": self.item_sum,
+            "item_count": self.item_count,
+        }
+        if self.updatable:
+            arrays["pair_rows"] = self.pair_rows
+            arrays["pair_cols"] = self.pair_cols
+            for name, array in self.pair_acc.items():
+                arrays["pair_" + name] = array
+        if self.metric != 1 or self.neighbors:
+            arrays["neighbor_indptr"] = self.neighbor_indptr
+            arrays["neighbor_indices"] = self.neighbor_indices
+            arrays["neighbor_similarity"] = self.neighbor_similarity
+        else:
+            # Every user mode: nonzero similarities of upper triangle rebuild rating matrix(User)
+            rows, cols = np.nonzero(np.triu(self.user_similarity, k=1))
+            arrays["similarity_rows"] = rows.astype(np.int64)
+            arrays["similarity_cols"] = cols.astype(np.int64)
+            arrays["similarity_values"] = self.user_similarity[rows, cols]
+
+        header = {
+            "metric": self.metric,
+            "similarity": self.similarity,
+            "neighbors": self.neighbors,
+            "significance": self.significance,
+            "updatable": self.updatable,
+            "shape": list(self.ratings.shape),
+            "accumulators": list(self.pair_acc.keys()) if self.updatable else [],
+            "arrays": [],
+        }
+        offset = 0
+        for name, array in arrays.items():
+            header["arrays"].append([name, array.dtype.str, len(array), offset])
+            offset += (array.nbytes + 7) // 8 * 8
+        encoded = json.dumps(header).encode("utf-8")
+        # Arrays start at 8-byte boundary
+        start = (MODEL_PREFIX.size + len(encoded) + 7) // 8 * 8
+
+        # Write aside then replace: loaded model may still map old file
+        with open(model_file + ".tmp", 'wb') as f:
+            f.write(MODEL_PREFIX.pack(MODEL_MAGIC, MODEL_VERSION, len(encoded)))
+            f.write(encoded)
+            for (name, _, _, array_offset), array in zip(header["arrays"], arrays.values()):
+                f.seek(start + array_offset)
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.truncate(start + offset)
+        os.replace(model_file + ".tmp", model_file)
+
+
+    # Load saved model without training: arrays are memory-mapped(copy on write)
+    @classmethod
+    def load(cls, model_file, prediction="batch"):
+        with open(model_file, 'rb') as f:
+            magic, version, length = MODEL_PREFIX.unpack(f.read(MODEL_PREFIX.size))
+            if magic != MODEL_MAGIC:
+                raise ValueError("{} is not a recommender model".format(model_file))
+            if version != MODEL_VERSION:
+                raise ValueError("unsupported model version {} (expected {})".format(version, MODEL_VERSION))
+            header = json.loads(f.read(length).decode("utf-8"))
+        start = (MODEL_PREFIX.size + length + 7) // 8 * 8
+
+        arrays = {}
+        for name, dtype, length, offset in header["arrays"]:
+            # Empty array cannot be mapped
+            if length == 0:
+                arrays[name] = np.zeros(0, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(model_file, dtype=dtype, mode='c', offset=start+offset, shape=(length,))
+
+        recommender = cls.__new__(cls)
+        recommender.metric = header["metric"]
+        recommender.similarity = header["similarity"]
+        recommender.neighbors = header["neighbors"]
+        recommender.significance = header["significance"]
+        recommender.prediction = prediction
+        recommender.workers = 1
+        recommender.updatable = header["updatable"]
+        recommender.user_ids = arrays["user_ids"].tolist()
+        recommender.item_ids = arrays["item_ids"].tolist()
+        recommender.ratings = sparse.csr_matrix((arrays["ratings_data"], arrays["ratings_indices"], arrays["ratings_indptr"]), shape=tuple(header["shape"]))
+        for name in ("user_sum", "user_count", "item_sum", "item_count"):
+            setattr(recommender, name, arrays[name])
+        if recommender.updatable:
+            recommender.pair_rows, recommender.pair_cols = arrays["pair_rows"], arrays["pair_cols"]
+            recommender.pair_acc = {name: arrays["pair_" + name] for name in header["accumulators"]}
+        else:
+            recommender.pair_rows = recommender.pair_cols = recommender.pair_acc = None
+        recommender._get_views()
+
+        if recommender.metric != 1 or recommender.neighbors:
+            recommender.training_user = None
+            for name in ("neighbor_indptr", "neighbor_indices", "neighbor_similarity"):
+                setattr(recommender, name, arrays[name])
+        else:
+            # Every user mode: rating matrix(User), training data for pair by pair prediction only
+            recommender.training_user = None
+            if prediction == "loop":
+                recommender._get_training_user()
+            recommender._get_user_matrix(arrays["similarity_rows"], arrays["similarity_cols"], arrays["similarity_values"])
+        return recommender
+
+
+    # Training data(User) from rating matrix
+    def _get_training_user(self):
+        self.training_user = {}
+        indptr, indices = self.ratings.indptr, self.ratings.indices
+        ratings = self.ratings.data.astype(int)
+        for u, uid in enumerate(self.user_ids):
+            self.training_user[uid] = {self.item_ids[k]: rating for k, rating in zip(indices[indptr[u]:indptr[u+1]].tolist(), ratings[indptr[u]:indptr[u+1]].tolist())}
+
+
+    # Apply new ratings [(user id, item id, rating) ...]: last rating of (user, item) wins
+    # Only sums of rated users & items and pairs sharing rated items(users) are updated
+    def update(self, new_ratings):
+        if not self.updatable:
+            raise ValueError("model keeps no pair sums to update: train with updatable")
+        latest = {}
+        for uid, iid, rating in new_ratings:
+            latest[(uid, iid)] = rating
+        if not latest:
+            return
+
+        # New users & items: appended
+        n_users, n_items = len(self.user_ids), len(self.item_ids)
+        for uid, iid in latest.keys():
+            if uid not in self.user_index:
+                self.user_index[uid] = len(self.user_ids)
+                self.user_ids.append(uid)
+            if iid not in self.item_index:
+                self.item_index[iid] = len(self.item_ids)
+                self.item_ids.append(iid)
+        shape = (len(self.user_ids), len(self.item_ids))
+        indptr = np.concatenate([self.ratings.indptr, np.full(shape[0]-n_users, self.ratings.indptr[-1])])
+        old = sparse.csr_matrix((self.ratings.data, self.ratings.indices, indptr), shape=shape)
+
+        rows = np.array([self.user_index[uid] for uid, _ in latest.keys()])
+        cols = np.array([self.item_index[iid] for _, iid in latest.keys()])
+        values = np.array(list(latest.values()), dtype=np.float64)
+        previous = self._gather(old, rows, cols)
+        # Change of rating & of co-rating mask(previous 0: new rating)
+        added = (previous == 0).astype(np.float64)
+        delta = sparse.csr_matrix((values - previous, (rows, cols)), shape=shape)
+        delta_mask = sparse.csr_matrix((added, (rows, cols)), shape=shape)
+        changed = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=shape)
+        new = (old + delta).tocsr()
+        new.sort_indices()
+
+        # Rating sums & counts
+        self.user_sum = np.concatenate([self.user_sum, np.zeros(shape[0]-n_users)]) + np.bincount(rows, weights=values-previous, minlength=shape[0])
+        self.user_count = np.concatenate([self.user_count, np.zeros(shape[0]-n_users)]) + np.bincount(rows, weights=added, minlength=shape[0])
+        self.item_sum = np.concatenate([self.item_sum, np.zeros(shape[1]-n_items)]) + np.bincount(cols, weights=values-previous, minlength=shape[1])
+        self.item_count = np.concatenate([self.item_count, np.zeros(shape[1]-n_items)]) + np.bincount(cols, weights=added, minlength=shape[1])
+
+        # Pairs sharing a changed rating: (a, c) with c rating what a changed
+        old_e, delta_e, new_e = (self._get_entity_matrix(matrix) for matrix in (old, delta, new))
+        old_mask, delta_mask = self._get_mask(old_e), self._get_entity_matrix(delta_mask)
+        touched = self._get_mask(new_e) @ self._get_entity_matrix(changed).T
+        pairs = sparse.triu(touched + touched.T, k=1).tocoo()
+        order = np.lexsort((pairs.col, pairs.row))
+        pair_rows, pair_cols = pairs.row[order].astype(np.int64), pairs.col[order].astype(np.int64)
+
+        # Change of co-rated sums: same products as _get_similarity_block
+        old_squares = old_e.multiply(old_e)
+        squares = self._get_delta_product(old_squares, new_e.multiply(new_e) - old_squares, old_mask, delta_mask)
+        changes = {
+            "count": self._gather(self._get_delta_product(old_mask, delta_mask, old_mask, delta_mask), pair_rows, pair_cols),
+            "xy": self._gather(self._get_delta_product(old_e, delta_e, old_e, delta_e), pair_rows, pair_cols),
+            "xx": self._gather(squares, pair_rows, pair_cols),
+            "yy": self._gather(squares, pair_cols, pair_rows),
+        }
+        if self.similarity == "pcc":
+            sums = self._get_delta_product(old_e, delta_e, old_mask, delta_mask)
+            changes["x"] = self._gather(sums, pair_rows, pair_cols)
+            changes["y"] = self._gather(sums, pair_cols, pair_rows)
+
+        # Existing pairs: add changes, new pairs: insert in (row, col) order
+        n = new_e.shape[0]
+        keys = self.pair_rows*n + self.pair_cols
+        changed_keys = pair_rows*n + pair_cols
+        positions = np.searchsorted(keys, changed_keys)
+        found = positions < len(keys)
+        found[found] = keys[positions[found]] == changed_keys[found]
+        acc = {}
+        for name, array in self.pair_acc.items():
+            array = np.array(array)
+            array[positions[found]] += changes[name][found]
+            acc[name] = np.insert(array, positions[~found], changes[name][~found])
+        self.pair_acc = acc
+        self.pair_rows = np.insert(self.pair_rows, positions[~found], pair_rows[~found])
+        self.pair_cols = np.insert(self.pair_cols, positions[~found], pair_cols[~found])
+
+        self.ratings = new
+        self._get_views()
+        if self.training_user is not None:
+            for (uid, iid), rating in latest.items():
+                self.training_user.setdefault(uid, {})[iid] = rating
+        if self.metric != 1 or self.neighbors:
+            self._update_neighbors(pair_rows, pair_cols, n)
+        else:
+            positions = np.searchsorted(self.pair_rows*n + self.pair_cols, changed_keys)
+            self._update_user_matrix(pair_rows, pair_cols, self._get_pair_similarity({name: array[positions] for name, array in self.pair_acc.items()}))
+
+
+    # Co-rating mask of ratings
+    def _get_mask(self, ratings):
+        mask = ratings.copy()
+        mask.data[:] = 1.0
+        return mask
+
+
+    # Change of A B^T when A, B change by dA, dB: dA B^T + A dB^T + dA dB^T
+    def _get_delta_product(self, a, da, b, db):
+        return (da @ b.T + a @ db.T + da @ db.T).tocsr()
+
+
+    # Rank again neighbors of rows in changed pairs, other rows keep their neighbors
+    def _update_neighbors(self, pair_rows, pair_cols, n):
+        keep = np.zeros(n, dtype=bool)
+        keep[pair_rows] = True
+        keep[pair_cols] = True
+        selected = keep[self.pair_rows] | keep[self.pair_cols]
+        similarity = self._get_pair_similarity({name: array[selected] for name, array in self.pair_acc.items()})
+        rows, cols, similarity = self._get_top_k(self.pair_rows[selected], self.pair_cols[selected], similarity, self.pair_acc["count"][selected], keep)
+
+        old_rows = np.repeat(np.arange(len(self.neighbor_indptr)-1), np.diff(self.neighbor_indptr))
+        stay = ~keep[old_rows]
+        self._set_neighbors(np.concatenate([old_rows[stay], rows]), np.concatenate([self.neighbor_indices[stay], cols]), np.concatenate([self.neighbor_similarity[stay], similarity]), n)
+
+
+    # Set similarity of changed pairs in rating matrix(User), new users start without similar users
+    def _update_user_matrix(self, pair_rows, pair_cols, similarity):
+        n_old = len(self.user_similarity)
+        if len(self.user_ids) > n_old:
+            grow = len(self.user_ids) - n_old
+            self.user_similarity = np.pad(self.user_similarity, ((0, grow), (0, grow)))
+            self.user_similarity[np.arange(n_old, len(self.user_ids)), np.arange(n_old, len(self.user_ids))] = 1.0
+            if self.user_matrix is not None:
+                for uid in self.user_ids[n_old:]:
+                    for row in self.user_matrix.values():
+                        row[uid] = 0.0
+                    self.user_matrix[uid] = {j: 0.0 for j in self.user_ids}
+                    self.user_matrix[uid][uid] = 1.0
+
+        self.user_similarity[pair_rows, pair_cols] = similarity
+        self.user_similarity[pair_cols, pair_rows] = similarity
+        if self.user_matrix is not None:
+            for i, j, value in zip(pair_rows.tolist(), pair_cols.tolist(), similarity.tolist()):
+                self.user_matrix[self.user_ids[i]][self.user_ids[j]] = value
+                self.user_matrix[self.user_ids[j]][self.user_ids[i]] = value
 
 
     def _get_cosine_similarity(self, v1, v2):
@@ -121,54 +406,205 @@ class Recommender:
             return 0.0
 
 
-    def _get_user_matrix(self):
-        # Cosine similarity method
-        # Set threshold: 0%
-        threshold = len(self.training_user.keys()) * 0.0
-        for i in self.training_user.keys():
-            for j in self.training_user.keys():
-                if i == j:
-                    self.user_matrix[i][j] = 1.0
-                else:
-                    v1_dict = self.training_user[i]
-                    v2_dict = self.training_user[j]
-                    v1 = []
-                    v2 = []
-                    for iid in set(list(v1_dict.keys())+list(v2_dict.keys())):
-                        if iid in v1_dict and iid in v2_dict:
-                            v1.append(v1_dict[iid])
-                            v2.append(v2_dict[iid])
-
-                    # Avoid empty list
-                    if v1 and v2:
-                        if len(v1) >= threshold:
-                            self.user_matrix[i][j] = self._get_cosine_similarity(v1,v2) 
-                        else:
-                            self.user_matrix[i][j] = 0.0
-
-
-    def _get_item_matrix(self):
-        # Cosine similarity method
-        for i in self.training_item.keys():
-            for j in self.training_item.keys():
-                if i == j:
-                    self.item_matrix[i][j] = 1.0
-                else:
-                    v1_dict = self.training_item[i]
-                    v2_dict = self.training_item[j]
-                    v1 = []
-                    v2 = []
-                    for uid in set(list(v1_dict.keys())+list(v2_dict.keys())):
-                        if uid in v1_dict and uid in v2_dict:
-                            v1.append(v1_dict[uid])
-                            v2.append(v2_dict[uid])
+    def _get_rating_matrix(self):
+        # Rows follow training_user order, columns follow sorted item id(users & items added by update are appended)
+        self.user_ids = list(self.training_user.keys())
+        self.item_ids = sorted({iid for ratings in self.training_user.values() for iid in ratings})
+        item_index = {iid: k for k, iid in enumerate(self.item_ids)}
+        indptr = [0]
+        indices = []
+        data = []
+        for uid in self.user_ids:
+            for iid, rating in self.training_user[uid].items():
+                indices.append(item_index[iid])
+                data.append(rating)
+            indptr.append(len(indices))
+        self.ratings = sparse.csr_matrix((np.array(data, dtype=np.float64), indices, indptr), shape=(len(self.user_ids), len(self.item_ids)))
+        self.ratings.sort_indices()
+        # Rating sums & counts: averages
+        self.user_sum = np.asarray(self.ratings.sum(axis=1), dtype=np.float64).ravel()
+        self.user_count = np.diff(self.ratings.indptr).astype(np.float64)
+        self.item_sum = np.asarray(self.ratings.sum(axis=0), dtype=np.float64).ravel()
+        self.item_count = np.bincount(self.ratings.indices, minlength=len(self.item_ids)).astype(np.float64)
+        self._get_views()
+
+
+    # Lookups from ratings & sums: id -> position, averages, inverted index
+    def _get_views(self):
+        self.user_index = {uid: k for k, uid in enumerate(self.user_ids)}
+        self.item_index = {iid: k for k, iid in enumerate(self.item_ids)}
+        # User average rating: {'user id': average value ...}
+        # Item average rating: {'item id': average value ...}
+        self.user_mean = self.user_sum / self.user_count
+        self.item_mean = self.item_sum / self.item_count
+        self.user_avg = dict(zip(self.user_ids, self.user_mean.tolist()))
+        self.item_avg = dict(zip(self.item_ids, self.item_mean.tolist()))
+        # Global average rating: user not in training data
+        self.global_mean = float(self.user_sum.sum() / self.user_count.sum())
+        # Inverted index(Item -> raters): CSC rating matrix
+        self.item_raters = self.ratings.tocsc()
+        self.item_raters.sort_indices()
+
+
+    # Rows of similarity: users, or items in case of using item based
+    def _get_entity_matrix(self, ratings):
+        return ratings if self.metric == 1 else ratings.T.tocsr()
+
 
-                    # Avoid empty list
-                    if v1 and v2:
-                        self.item_matrix[i][j] = self._get_cosine_similarity(v1,v2) 
+    # Co-rated pairs once(pair_rows < pair_cols, sorted) & their sums(pair_acc)
+    def _get_pairs(self):
+        self.pair_rows, self.pair_cols, self.pair_acc = self._get_similarity(self._get_entity_matrix(self.ratings))
+
+
+    # Co-rated sums of every row pair(users, or items of transposed ratings) once: (rows, cols, sums) with rows < cols
+    # Sorted by (rows, cols): same output in serial & parallel
+    def _get_similarity(self, ratings):
+        if self.workers <= 1:
+            return self._get_similarity_block(ratings, 0, ratings.shape[0])
+
+        shms = []
+        blocks = []
+        try:
+            # Share CSR arrays with workers
+            for array in (ratings.data, ratings.indices, ratings.indptr):
+                shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                shms.append(shm)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+                blocks.append((shm.name, len(array), array.dtype.str))
+
+            # Row blocks: more blocks than workers, upper rows have more pairs
+            bounds = np.linspace(0, ratings.shape[0], self.workers*4+1).astype(int)
+            tasks = [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+            with Pool(self.workers, initializer=init_worker, initargs=(self.similarity, blocks, ratings.shape)) as pool:
+                results = pool.map(similarity_block, tasks)
+        finally:
+            for shm in shms:
+                shm.close()
+                shm.unlink()
+
+        rows = np.concatenate([result[0] for result in results])
+        cols = np.concatenate([result[1] for result in results])
+        acc = {name: np.concatenate([result[2][name] for result in results]) for name in results[0][2]}
+        return rows, cols, acc
+
+
+    # Co-rated sums of pairs (i, j) with start <= i < end, i < j
+    def _get_similarity_block(self, ratings, start, end):
+        # Co-rated sums from sparse products of ratings & co-rating masks
+        # Set threshold: 0%
+        threshold = ratings.shape[0] * 0.0
+        mask = self._get_mask(ratings)
+        block = ratings[start:end]
+        block_mask = mask[start:end]
+        # (i, j): number of co-rated items
+        counts = (block_mask @ mask.T).tocoo()
+
+        # Symmetric: each pair once from upper triangle
+        keep = (counts.col > counts.row + start) & (counts.data >= threshold)
+        local, cols, n = counts.row[keep], counts.col[keep], counts.data[keep]
+        order = np.lexsort((cols, local))
+        local, cols, n = local[order], cols[order], n[order]
+        # (i, j): sum of r(i)*r(j), sum of r(i)^2 over items rated by j, sum of r(j)^2 over items rated by i
+        acc = {"count": n}
+        acc["xy"] = self._gather(block @ ratings.T, local, cols)
+        acc["xx"] = self._gather(block.multiply(block) @ mask.T, local, cols)
+        acc["yy"] = self._gather(block_mask @ ratings.multiply(ratings).T, local, cols)
+        if self.similarity == "pcc":
+            acc["x"] = self._gather(block @ mask.T, local, cols)
+            acc["y"] = self._gather(block_mask @ ratings.T, local, cols)
+
+        return (local + start).astype(np.int64), cols.astype(np.int64), acc
+
+
+    # Similarity from co-rated sums of pairs
+    def _get_pair_similarity(self, acc):
+        if self.similarity == "pcc":
+            n = acc["count"]
+            # Scaled by n^2: exact on integer sums
+            numerator = n*acc["xy"] - acc["x"]*acc["y"]
+            denominator = np.power(n*acc["xx"] - acc["x"]**2, 0.5) * np.power(n*acc["yy"] - acc["y"]**2, 0.5)
+            # Constant ratings: 0.0
+            return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+        return acc["xy"] / (self._get_root(acc["xx"]) * self._get_root(acc["yy"]))
+
+
+    # Similarity of pairs (rows, cols) of upper triangle: other pairs are 0
+    def _get_user_matrix(self, rows, cols, similarity):
+        # Similarity array(User x User, training user order)
+        self.user_similarity = np.eye(len(self.user_ids))
+        self.user_similarity[rows, cols] = similarity
+        self.user_similarity[cols, rows] = similarity
+        # Pair by pair prediction only: rating matrix(User) {'user id': {'user id': similarity ...} ...}
+        self.user_matrix = None
+        if self.prediction != "loop":
+            return
+        self.user_matrix = {i: {j: 0.0 for j in self.user_ids} for i in self.user_ids}
+        for i, j, value in zip(rows.tolist(), cols.tolist(), similarity.tolist()):
+            self.user_matrix[self.user_ids[i]][self.user_ids[j]] = value
+            self.user_matrix[self.user_ids[j]][self.user_ids[i]] = value
+        for uid in self.user_ids:
+            self.user_matrix[uid][uid] = 1.0
+
+
+    # Top-k similar users per user(items per item in case of using item based)
+    # neighbor_indices[neighbor_indptr[r]:neighbor_indptr[r+1]] sorted by position(every co-rated one when neighbors is 0)
+    def _get_neighbors(self):
+        similarity = self._get_pair_similarity(self.pair_acc)
+        n = self._get_entity_matrix(self.ratings).shape[0]
+        self._set_neighbors(*self._get_top_k(self.pair_rows, self.pair_cols, similarity, self.pair_acc["count"]), n)
+
+
+    # Neighbors (rows, cols, similarity) of each row from pairs of upper triangle & their co-rated counts
+    # keep: mask of rows to rank(others dropped)
+    def _get_top_k(self, rows, cols, similarity, counts, keep=None):
+        rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+        similarity = np.concatenate([similarity, similarity])
+        counts = np.concatenate([counts, counts])
+        if keep is not None:
+            kept = keep[rows]
+            rows, cols, similarity, counts = rows[kept], cols[kept], similarity[kept], counts[kept]
+
+        if self.neighbors:
+            # Cosine of one co-rated item is 1.0: rank by similarity x min(count, significance) / significance
+            score = similarity * np.minimum(counts, self.significance) / self.significance if self.significance else similarity
+            # Rank neighbors of each row: score descending, count descending, position ascending on tie
+            order = np.lexsort((cols, -counts, -score, rows))
+            rows, cols, similarity = rows[order], cols[order], similarity[order]
+            rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+            kept = rank < self.neighbors
+            rows, cols, similarity = rows[kept], cols[kept], similarity[kept]
+        return rows, cols, similarity
+
+
+    # Compact neighbor arrays(indptr, indices, similarity) of n rows
+    def _set_neighbors(self, rows, cols, similarity, n):
+        order = np.lexsort((cols, rows))
+        self.neighbor_indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))]).astype(np.int64)
+        self.neighbor_indices = cols[order].astype(np.int32)
+        self.neighbor_similarity = similarity[order]
+
+
+    # Square root of each distinct value: same rounding as _get_cosine_similarity
+    def _get_root(self, values):
+        unique, inverse = np.unique(values, return_inverse=True)
+        return np.array([value**(1/2) for value in unique.tolist()], dtype=np.float64)[inverse]
+
+
+    # Values of CSR matrix at (rows[k], cols[k])
+    def _gather(self, matrix, rows, cols):
+        if len(rows) == 0:
+            return np.zeros(0)
+        # Sorted column indices: binary search per value
+        matrix = matrix.tocsr()
+        matrix.sort_indices()
+        return np.asarray(matrix[rows, cols], dtype=np.float64).ravel()
 
 
     def _get_rating_user(self, uid, iid):
+        # User not in training data: global average
+        if uid not in self.user_index:
+            return self._clip_rating(self.global_mean)
+
         fraction = 0.0
         denominator = 0.0
 
@@ -183,55 +619,143 @@ class Recommender:
         except ZeroDivisionError:
             ret = self.user_avg[uid]
 
-        ret = int(ret+0.5)
-        # Clip value
-        if ret > 5:
-            ret = 5
-        if ret < 1:
-            ret = 1
-        return ret
-       
-       
-    def _get_rating_item(self, uid, iid):
+        return self._clip_rating(ret)
+
+
+    # Same weighted average as _get_rating_user from similarity array: raters summed in training user order
+    def _get_rating_user_exact(self, uid, iid):
+        u = self.user_index[uid]
         fraction = 0.0
         denominator = 0.0
 
-        for item in self.item_matrix.keys():
-            if item == iid:
-                continue
-            if uid in self.training_item[item] and iid in self.item_matrix[item]:
-                fraction += self.item_matrix[item][iid] * (self.training_item[item][uid]-self.item_avg[item])
-                denominator += self.item_matrix[iid][item]
+        if iid in self.item_index:
+            k = self.item_index[iid]
+            start, end = self.item_raters.indptr[k], self.item_raters.indptr[k+1]
+            for user, rating in zip(self.item_raters.indices[start:end].tolist(), self.item_raters.data[start:end].tolist()):
+                similarity = self.user_similarity[u, user].item()
+                fraction += similarity * (rating-self.user_avg[self.user_ids[user]])
+                denominator += similarity
 
         # Avoid divide by zero
         try:
-            ret = self.item_avg[iid] + fraction / denominator
+            ret = self.user_avg[uid] + (fraction / denominator)
         except ZeroDivisionError:
-        # Inject lowest value
-            ret = self.item_avg[iid]
+            ret = self.user_avg[uid]
+
+        return self._clip_rating(ret)
 
+
+    # Weighted average over top-k neighbors who rated item(user itself is no neighbor)
+    def _get_rating_neighbors(self, uid, iid):
+        # User not in training data: global average
+        if uid not in self.user_index:
+            return self._clip_rating(self.global_mean)
+
+        u = self.user_index[uid]
+        ret = self.user_avg[uid]
+        if iid in self.item_index:
+            k = self.item_index[iid]
+            neighbors = self.neighbor_indices[self.neighbor_indptr[u]:self.neighbor_indptr[u+1]]
+            raters = self.item_raters.indices[self.item_raters.indptr[k]:self.item_raters.indptr[k+1]]
+            common, a, b = np.intersect1d(neighbors, raters, assume_unique=True, return_indices=True)
+            similarity = self.neighbor_similarity[self.neighbor_indptr[u]:][a]
+            ratings = self.item_raters.data[self.item_raters.indptr[k]:][b]
+            fraction = float(np.dot(similarity, ratings - self.user_mean[common]))
+            denominator = float(similarity.sum())
+            # Avoid divide by zero
+            if denominator != 0.0:
+                ret += fraction / denominator
+
+        return self._clip_rating(ret)
+
+
+    def _clip_rating(self, ret):
         ret = int(ret+0.5)
         # Clip value
         if ret > 5:
             ret = 5
         if ret < 1:
             ret = 1
-
         return ret
+       
+       
+    # Weighted average over similar items rated by user
+    def _get_rating_item(self, uid, iid):
+        # Item not in training data: user average(global average for user not in training data)
+        if iid not in self.item_index:
+            return self._clip_rating(self.user_avg.get(uid, self.global_mean))
+
+        k = self.item_index[iid]
+        ret = self.item_avg[iid]
+        if uid in self.user_index:
+            u = self.user_index[uid]
+            neighbors = self.neighbor_indices[self.neighbor_indptr[k]:self.neighbor_indptr[k+1]]
+            rated = self.ratings.indices[self.ratings.indptr[u]:self.ratings.indptr[u+1]]
+            common, a, b = np.intersect1d(neighbors, rated, assume_unique=True, return_indices=True)
+            similarity = self.neighbor_similarity[self.neighbor_indptr[k]:][a]
+            ratings = self.ratings.data[self.ratings.indptr[u]:][b]
+            fraction = float(np.dot(similarity, ratings - self.item_mean[common]))
+            denominator = float(similarity.sum())
+            # Avoid divide by zero
+            if denominator != 0.0:
+                ret += fraction / denominator
+
+        return self._clip_rating(ret)
+
+
+    # Every test pair of item at once: similarity block x mean-centered ratings of raters
+    def _predict_batch(self):
+        test_items = {}
+        for uid in self.test.keys():
+            # User not in training data: global average
+            if uid not in self.user_index:
+                for iid in self.test[uid].keys():
+                    self.test[uid][iid] = self._clip_rating(self.global_mean)
+                continue
+            for iid in self.test[uid].keys():
+                test_items.setdefault(iid, []).append(uid)
+
+        for iid, uids in test_items.items():
+            rows = np.array([self.user_index[uid] for uid in uids])
+            ret = self.user_mean[rows].copy()
+            denominator = np.zeros(len(rows))
+            if iid in self.item_index:
+                k = self.item_index[iid]
+                raters = self.item_raters.indices[self.item_raters.indptr[k]:self.item_raters.indptr[k+1]]
+                ratings = self.item_raters.data[self.item_raters.indptr[k]:self.item_raters.indptr[k+1]]
+                similarity = self.user_similarity[np.ix_(rows, raters)]
+                fraction = similarity @ (ratings - self.user_mean[raters])
+                denominator = similarity.sum(axis=1)
+                # Avoid divide by zero
+                np.divide(fraction, denominator, out=fraction, where=denominator != 0.0)
+                ret += np.where(denominator != 0.0, fraction, 0.0)
+
+            # Summation order differs from _get_rating_user: recompute values next to rounding boundary or zero denominator
+            shifted = ret + 0.5
+            exact = (np.abs(shifted - np.round(shifted)) < 1e-9) | ((np.abs(denominator) < 1e-9) & (denominator != 0.0))
+            values = np.clip(np.floor(shifted), 1, 5).astype(int).tolist()
+            for uid, value, recompute in zip(uids, values, exact.tolist()):
+                self.test[uid][iid] = self._get_rating_user_exact(uid, iid) if recompute else value
 
 
     def _predict(self):
-        # User user based only
+        # Batch: every user based only
+        if self.metric == 1 and not self.neighbors and self.prediction == "batch":
+            self._predict_batch()
+            return
+
         for uid in self.test.keys():
             for iid in self.test[uid].keys():
                 if self.metric != 1:
                     self.test[uid][iid] = self._get_rating_item(uid, iid)
+                elif self.neighbors:
+                    self.test[uid][iid] = self._get_rating_neighbors(uid, iid)
                 else:
                     self.test[uid][iid] = self._get_rating_user(uid, iid) 
 
 
-    def _write(self):
-        with open(self.output, 'w') as f:
+    def _write(self, output):
+        with open(output, 'w') as f:
             for uid in self.test.keys():
                 for iid in self.test[uid]:
                     f.write("{}\t{}\t{}\n".format(uid,iid,self.test[uid][iid]))
@@ -242,7 +766,39 @@ class Recommender:
 if __name__ == "__main__":
     # Parse arguments
     parser = argparse.ArgumentParser()
-    parser.add_argument("training_file", type=str)
-    parser.add_argument("test_file", type=str)
+    parser.add_argument("files", type=str, nargs="+", metavar="file", help="training_file test_file, or test_file with --load-model")
+    parser.add_argument("--mode", type=str, choices=["user", "item"], default="user", help="user based or item based collaborative filtering")
+    parser.add_argument("--similarity", type=str, choices=["cosine", "pcc"], default="cosine")
+    parser.add_argument("--neighbors", type=int, default=0, help="keep top-k similar users per user or items per item (0: every user / every co-rated item)")
+    parser.add_argument("--significance", type=int, default=50, help="co-rated count below which similarity is scaled down when ranking top-k neighbors (0: similarity only)")
+    parser.add_argument("--prediction", type=str, choices=["batch", "loop"], default="batch", help="predict with every user in batch grouped by item or pair by pair")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes computing similarity")
+    parser.add_argument("--updatable", action="store_true", help="keep co-rated sums of every pair so --update can apply new ratings (memory & model size grow with co-rated pairs)")
+    parser.add_argument("--extra-test", type=str, action="append", default=[], help="also predict this test file with same model into <file>_prediction.txt")
+    parser.add_argument("--save-model", type=str, help="save trained(or updated) model to model file")
+    parser.add_argument("--load-model", type=str, help="predict with saved model instead of training: prediction into <test_file>_prediction.txt")
+    parser.add_argument("--update", type=str, help="ratings file applied to loaded model before predicting")
     args = parser.parse_args()
-    recommender = Recommender(args)
+
+    if args.load_model:
+        if len(args.files) != 1:
+            parser.error("--load-model takes test_file")
+        recommender = Recommender.load(args.load_model, args.prediction)
+        if args.update and not recommender.updatable:
+            parser.error("--update needs model trained with --updatable")
+        if args.update:
+            recommender.update(read_ratings(args.update))
+        if args.save_model:
+            recommender.save(args.save_model)
+        recommender.recommend(args.files[0], args.files[0] + "_prediction.txt")
+    else:
+        if len(args.files) != 2:
+            parser.error("expected training_file test_file")
+        if args.update:
+            parser.error("--update needs --load-model")
+        args.training_file, args.test_file = args.files
+        recommender = Recommender(args)
+        if args.save_model:
+            recommender.save(args.save_model)
+    for test_file in args.extra_test:
+        recommender.recommend(test_file, test_file + "_prediction.txt")